@@ -1,23 +1,55 @@
 # Role: Thin HTTP adapter for the chat endpoint. Validates request/response shapes and delegates the entire
 # conversation turn to FlowController (business logic lives in core, not in the API layer).
 
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from backend.api.deps import flow_controller
+from backend.api.state import StateSnapshot
 
 router = APIRouter(tags=["chat"])
 
 class ChatRequest(BaseModel):
+    # Key line: schema only (OpenAPI docs). The handler checks the two str fields itself,
+    # so no ChatRequest instance is built per request.
     session_id: str
     user_message: str
 
 class ChatResponse(BaseModel):
+    # Key line: schema only (OpenAPI docs via responses=). The handler returns a JSONResponse directly,
+    # so no response_model field is built at startup and nothing is re-validated per request.
     session_id: str
     assistant_message: str
+    # Key line: the post-turn /state snapshot, so the UI refreshes its sidebar without a second request.
+    snapshot: StateSnapshot
 
-@router.post("/chat", response_model=ChatResponse)
-def chat(req: ChatRequest) -> ChatResponse:
-    # 1) Forward (session_id, user_message) to the orchestrator
-    # 2) Return the assistant text in a stable schema for UI/clients
-    result = flow_controller.handle_turn(req.session_id, req.user_message)
-    return ChatResponse(session_id=req.session_id, assistant_message=result.assistant_message)
+_CHAT_REQUEST_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": ChatRequest.model_json_schema()}},
+    }
+}
+
+@router.post("/chat", responses={200: {"model": ChatResponse}}, openapi_extra=_CHAT_REQUEST_OPENAPI)
+async def chat(request: Request) -> JSONResponse:
+    # 1) Read the raw JSON body and check (session_id, user_message) are strings
+    # 2) Forward them to the orchestrator
+    # 3) Return the assistant text (plus the updated state snapshot) in a stable schema for UI/clients
+    try:
+        body = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=422, detail="Request body must be valid JSON.")
+
+    session_id = body.get("session_id") if isinstance(body, dict) else None
+    user_message = body.get("user_message") if isinstance(body, dict) else None
+    if not (isinstance(session_id, str) and isinstance(user_message, str)):
+        raise HTTPException(status_code=422, detail="session_id and user_message must be strings.")
+
+    # Key line: handle_turn blocks on LLM/tool HTTP calls, so it runs in the threadpool, not on the event loop.
+    result = await run_in_threadpool(flow_controller.handle_turn, session_id, user_message)
+    # Key line: same cached snapshot dict /state serves; an in-memory read after the turn, no extra round-trip.
+    snapshot = flow_controller.state_manager.get_or_create(session_id).snapshot()
+    return JSONResponse(
+        {"session_id": session_id, "assistant_message": result.assistant_message, "snapshot": snapshot}
+    )
@@ -2,25 +2,23 @@
 # Does NOT change any flow logic. Only exposes current state snapshot by session_id.
 
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from backend.api.deps import flow_controller
 
 router = APIRouter(tags=["state"])
 
 class StateSnapshot(BaseModel):
+    # Key line: schema only (OpenAPI docs via responses=); get_state returns a plain JSON-safe dict directly.
     session_id: str
     trip_profile: dict
     pending_missing_info: list[str]
     last_intent: str | None
     turn_count: int
 
-@router.get("/state/{session_id}", response_model=StateSnapshot)
-def get_state(session_id: str) -> StateSnapshot:
+@router.get("/state/{session_id}", responses={200: {"model": StateSnapshot}})
+async def get_state(session_id: str) -> JSONResponse:
+    # Key line: pure in-memory read, so it runs inline on the event loop (no threadpool hop).
     state = flow_controller.state_manager.get_or_create(session_id)
-    return StateSnapshot(
-        session_id=session_id,
-        trip_profile=state.trip_profile.model_dump(),
-        pending_missing_info=state.pending_missing_info,
-        last_intent=state.last_intent.value if state.last_intent else None,
-        turn_count=state.turn_count,
-    )
\ No newline at end of file
+    # Key line: the snapshot dict is cached on State and only rebuilt after a mutation.
+    return JSONResponse(state.snapshot())
@@ -1,20 +1,48 @@
 # Role: Central configuration module. Loads .env into environment variables and computes runtime flags (DEBUG).
 # Importers read backend.config.DEBUG to control logging without threading flags through every call.
+# It also sets the level of the "backend" logger tree, for modules that log via logging.getLogger(__name__).
 
 from __future__ import annotations
 
+import logging
 import os
+import sys
+from functools import cache
 from dotenv import load_dotenv
 
 DEBUG: bool = False
 
+# Key line: accept common truthy values.
+_TRUTHY = frozenset({"1", "true", "yes"})
+
 
 def load_env() -> None:
     """
-    Load .env into os.environ, then recompute DEBUG.
+    Load .env into os.environ (parsed once per process), then recompute DEBUG.
     This makes DEBUG correct even if load_env() is called after import.
     """
     global DEBUG
+    _load_dotenv_once()
+    DEBUG = env_flag("DEBUG")
+    _configure_logging(DEBUG)
+
+
+def env_flag(name: str) -> bool:
+    # Role: read an on/off environment switch (unset or anything non-truthy means off).
+    return os.getenv(name, "0").lower() in _TRUTHY
+
+
+@cache
+def _load_dotenv_once() -> None:
+    # Key line: .env is read from disk on the first call only; later load_env() calls reuse os.environ.
     load_dotenv()
-    # Key line: accept common truthy values.
-    DEBUG = os.getenv("DEBUG", "0").lower() in {"1", "true", "yes"}
+
+
+def _configure_logging(debug: bool) -> None:
+    # Role: one-time level switch for backend.* loggers (debug output goes to stdout, like the print logs).
+    logger = logging.getLogger("backend")
+    logger.setLevel(logging.DEBUG if debug else logging.WARNING)
+    if debug and not logger.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+        logger.addHandler(handler)
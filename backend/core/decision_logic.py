@@ -3,13 +3,16 @@
 
 from __future__ import annotations
 
-import backend.config
+import logging
+from datetime import date
+from typing import Optional
 
 from backend.core.validator import ValidationResult
 from backend.models.decision import Action, Decision
 from backend.models.intent import Intent
 from backend.models.state import State
 from backend.utils.currency import (
+    CurrencyQuery,
     parse_currency_amount,
     parse_currency_pair,
     parse_currency_query,
@@ -21,12 +24,126 @@ from backend.utils.weather_rules import (
     is_seasonal_weather_question,
 )
 
-class DecisionLogic:
-    @staticmethod
-    def _is_numeric_amount(msg: str) -> bool:
-        return parse_currency_amount(msg) is not None
+logger = logging.getLogger(__name__)
+
+# Goals answered directly by the LLM (no tool, no extra slots beyond validation).
+_RESPONSE_GOAL_INTENTS = frozenset(
+    {
+        Intent.ITINERARY_PLANNING,
+        Intent.ATTRACTIONS_RECOMMENDATIONS,
+        Intent.PACKING_LIST,
+    }
+)
+
+# Key line: constant routing decisions are built once and shared (Decision is frozen; missing_info is a tuple).
+_DEC_OUT_OF_SCOPE = Decision(
+    action=Action.OUT_OF_SCOPE_RESPONSE,
+    notes="User request is outside supported travel domain",
+)
+_DEC_CLARIFY_GOAL = Decision(
+    action=Action.ASK_CLARIFICATION,
+    missing_info=("goal",),
+    notes="User message unclear -> ask for goal",
+)
+_DEC_GENERATE_BY_INTENT = {
+    intent: Decision(
+        action=Action.GENERATE_RESPONSE,
+        notes=(
+            f"{intent.value} -> generate response"
+            if intent in _RESPONSE_GOAL_INTENTS
+            else f"Default fallback routing for intent={intent.value}"
+        ),
+    )
+    for intent in Intent
+}
+
+_DEC_STILL_MISSING_AMOUNT = Decision(
+    action=Action.ASK_CLARIFICATION,
+    missing_info=("currency_amount",),
+    notes="Still missing currency_amount (sticky slot)",
+)
+_DEC_MISSING_AMOUNT = Decision(
+    action=Action.ASK_CLARIFICATION,
+    missing_info=("currency_amount",),
+    notes="Currency conversion missing amount (pair detected)",
+)
+_DEC_MISSING_PAIR = Decision(
+    action=Action.ASK_CLARIFICATION,
+    missing_info=("currency_pair",),
+    notes="Currency conversion missing currency pair",
+)
+
+
+def _is_numeric_amount(msg: str) -> bool:
+    return parse_currency_amount(msg) is not None
+
+
+def _combine_with_history(user_message: str, state: State, *, allow_amount_from_history: bool) -> Optional[CurrencyQuery]:
+    # Role: full parse of the current message, else combine partials with prior user messages.
+    return combine_currency_query_from_history(
+        user_message=user_message,
+        conversation_history=state.conversation_history,
+        stop=len(state.conversation_history) - 1,
+        allow_amount_from_history=allow_amount_from_history,
+    )
+
+
+def _currency_decision(user_message: str, currency_query: Optional[CurrencyQuery]) -> Decision:
+    # Key line: lazy %-formatting; nothing is built unless the "backend" logger is at DEBUG.
+    logger.debug("currency cq: %s", currency_query)
+
+    # Still missing -> decide which single clarification to ask next.
+    if currency_query is None:
+        if parse_currency_pair(user_message) is not None:
+            return _DEC_MISSING_AMOUNT
+        return _DEC_MISSING_PAIR
+
+    return Decision(
+        action=Action.CALL_TOOL,
+        tool_name="currency",
+        tool_payload={
+            "amount": float(currency_query.amount),
+            "from_ccy": currency_query.from_ccy,
+            "to_ccy": currency_query.to_ccy,
+        },
+        notes="Currency conversion -> call tool (use resolved currency_query; no re-parse in FlowController)",
+    )
+
+
+def _decide_currency_fresh(user_message: str, state: State) -> Decision:
+    # No currency slot pending: one-shot parse of the current message only.
+    return _currency_decision(user_message, parse_currency_query(user_message))
+
+
+def _decide_currency_pending_pair(user_message: str, state: State) -> Decision:
+    return _currency_decision(user_message, _combine_with_history(user_message, state, allow_amount_from_history=False))
+
 
-    def decide(self, intent: Intent, validation: ValidationResult, user_message: str, state: State) -> Decision:
+def _decide_currency_pending_amount(user_message: str, state: State) -> Decision:
+    currency_query = _combine_with_history(user_message, state, allow_amount_from_history=True)
+    # Key line: sticky slot (if we asked for amount, don't accept unrelated text).
+    if currency_query is None and not _is_numeric_amount(user_message):
+        logger.debug("currency cq: %s", currency_query)
+        return _DEC_STILL_MISSING_AMOUNT
+    return _currency_decision(user_message, currency_query)
+
+
+# Key line: one dict lookup on the pending slot picks the currency handler (anything else -> fresh parse).
+_CURRENCY_HANDLERS = {
+    "currency_amount": _decide_currency_pending_amount,
+    "currency_pair": _decide_currency_pending_pair,
+}
+
+
+class DecisionLogic:
+    def decide(
+        self,
+        intent: Intent,
+        validation: ValidationResult,
+        user_message: str,
+        state: State,
+        today: Optional[date] = None,
+    ) -> Decision:
         # 1) Handle out-of-scope and generic-help onboarding
         # 2) If validation fails -> ask for missing info
         # 3) Intent-specific routing:
@@ -35,17 +152,10 @@ class DecisionLogic:
         # 4) Default: generate response
 
         if intent == Intent.OUT_OF_SCOPE:
-            return Decision(
-                action=Action.OUT_OF_SCOPE_RESPONSE,
-                notes="User request is outside supported travel domain",
-            )
+            return _DEC_OUT_OF_SCOPE
 
         if intent == Intent.CLARIFICATION_NEEDED:
-            return Decision(
-                action=Action.ASK_CLARIFICATION,
-                missing_info=["goal"],
-                notes="User message unclear -> ask for goal",
-            )
+            return _DEC_CLARIFY_GOAL
 
         if not validation.ok:
             return Decision(
@@ -63,7 +173,7 @@ class DecisionLogic:
                 )
 
             # Key line: avoid tool usage outside Open-Meteo horizon (handled safely in response prompt/trust).
-            if not is_within_open_meteo_forecast_window(state.trip_profile):
+            if not is_within_open_meteo_forecast_window(state.trip_profile, today=today):
                 return Decision(
                     action=Action.GENERATE_RESPONSE,
                     notes="Weather query outside Open-Meteo window -> seasonal/general answer (no tool)",
@@ -76,67 +186,9 @@ class DecisionLogic:
             )
 
         if intent == Intent.CURRENCY_CONVERSION:
-            # Step 1: try parse from current message (one-shot).
-            currency_query = parse_currency_query(user_message)
-
-            # Step 2: if partial, try combining from history (amount in one message, pair in another).
-            if currency_query is None and state.pending_missing_info in (["currency_amount"], ["currency_pair"]):
-                currency_query = combine_currency_query_from_history(
-                    user_message=user_message,
-                    conversation_history=state.conversation_history[:-1],
-                    allow_amount_from_history=(state.pending_missing_info == ["currency_amount"]),
-                )
-
-            if backend.config.DEBUG:
-                print("DEBUG currency cq:", currency_query)
-
-            # Step 3: sticky slot behavior (if we asked for amount, don't accept unrelated text).
-            if state.pending_missing_info == ["currency_amount"] and currency_query is None:
-                if not self._is_numeric_amount(user_message):
-                    return Decision(
-                        action=Action.ASK_CLARIFICATION,
-                        missing_info=["currency_amount"],
-                        notes="Still missing currency_amount (sticky slot)",
-                    )
-
-            # Step 4: still missing -> decide which single clarification to ask next.
-            if currency_query is None:
-                pair = parse_currency_pair(user_message)
-                if pair is not None:
-                    return Decision(
-                        action=Action.ASK_CLARIFICATION,
-                        missing_info=["currency_amount"],
-                        notes="Currency conversion missing amount (pair detected)",
-                    )
-
-                return Decision(
-                    action=Action.ASK_CLARIFICATION,
-                    missing_info=["currency_pair"],
-                    notes="Currency conversion missing currency pair",
-                )
-
-            return Decision(
-                action=Action.CALL_TOOL,
-                tool_name="currency",
-                tool_payload={
-                    "amount": float(currency_query.amount),
-                    "from_ccy": currency_query.from_ccy,
-                    "to_ccy": currency_query.to_ccy,
-                },
-                notes="Currency conversion -> call tool (use resolved currency_query; no re-parse in FlowController)",
-            )
-
-        if intent in {
-            Intent.ITINERARY_PLANNING,
-            Intent.ATTRACTIONS_RECOMMENDATIONS,
-            Intent.PACKING_LIST,
-        }:
-            return Decision(
-                action=Action.GENERATE_RESPONSE,
-                notes=f"{intent.value} -> generate response",
-            )
+            # Key line: pending currency slots combine with history; otherwise parse the message alone.
+            handler = _CURRENCY_HANDLERS.get(state.pending_slot, _decide_currency_fresh)
+            return handler(user_message, state)
 
-        return Decision(
-            action=Action.GENERATE_RESPONSE,
-            notes=f"Default fallback routing for intent={intent.value}",
-        )
+        # Response goals and the default fallback both generate a response; notes are precomputed per intent.
+        return _DEC_GENERATE_BY_INTENT[intent]
@@ -0,0 +1,103 @@
+# Role: Optional content-addressed disk cache for LLM-written fallback replies. Repeated failures with the same
+# (intent, user message, recent history, trip profile, error class) reuse the stored reply instead of calling
+# the LLM again. Enabled only when FALLBACK_CACHE_DIR is set (or a directory is passed in); otherwise get/put
+# are no-ops. Entries older than the TTL are misses, and put() prunes the directory to max_entries.
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from backend.models.intent import Intent
+
+# Key line: the schema version hashes the Intent names, so adding/renaming an intent invalidates old entries.
+_SCHEMA_VERSION = hashlib.sha256("|".join(sorted(i.name for i in Intent)).encode("utf-8")).hexdigest()[:16]
+
+
+class FallbackCache:
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        ttl_seconds: float = 7 * 86400.0,
+        max_entries: int = 1000,
+    ) -> None:
+        root = cache_dir or os.getenv("FALLBACK_CACHE_DIR")
+        self._dir: Optional[Path] = Path(root) / _SCHEMA_VERSION if root else None
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+
+    @property
+    def enabled(self) -> bool:
+        return self._dir is not None
+
+    @staticmethod
+    def make_key(
+        intent_for_flow: Optional[Intent],
+        user_message: str,
+        recent_messages: Sequence[Dict[str, str]],
+        trip_profile: Dict[str, Any],
+        error: Optional[str],
+    ) -> str:
+        # Key line: only the error class matters ("RuntimeError('...')" -> "RuntimeError"), not its message text.
+        error_class = (error or "").split("(", 1)[0]
+        intent = intent_for_flow.value if intent_for_flow is not None else ""
+        # Key line: the fallback prompt includes the recent conversation, so a reply is only reusable within it.
+        history = json.dumps([[m.get("role"), m.get("content")] for m in recent_messages], ensure_ascii=False)
+        profile = json.dumps(trip_profile, sort_keys=True, ensure_ascii=False)
+        raw = f"{intent}|{user_message}|{history}|{profile}|{error_class}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        if self._dir is None:
+            return None
+        path = self._dir / f"{key}.json"
+        try:
+            if time.time() - path.stat().st_mtime > self._ttl_seconds:
+                return None
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        # 1) Write to a temp file in the same directory
+        # 2) os.replace -> readers see either the old file or the complete new one, never a partial write
+        if self._dir is None:
+            return
+        # Key line: the cache is best-effort; a failed write must never break the turn.
+        try:
+            self._dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self._dir, suffix=".tmp")
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(value, f, ensure_ascii=False)
+            os.replace(tmp_path, self._dir / f"{key}.json")
+        except OSError:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_path)
+            return
+        self._prune()
+
+    def _prune(self) -> None:
+        # Role: bound the directory. Drop expired entries, then the oldest ones beyond max_entries.
+        # Key line: runs only on put (LLM-written fallbacks are rare), so a directory scan here is cheap.
+        now = time.time()
+        entries: List[Tuple[float, Path]] = []
+        for path in self._dir.glob("*.json"):
+            with contextlib.suppress(OSError):
+                entries.append((path.stat().st_mtime, path))
+        entries.sort()
+        excess = len(entries) - self._max_entries
+        for i, (mtime, path) in enumerate(entries):
+            if i >= excess and now - mtime <= self._ttl_seconds:
+                break
+            with contextlib.suppress(OSError):
+                path.unlink()
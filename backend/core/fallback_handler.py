@@ -4,26 +4,22 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 
 from backend.core.validator import Validator
-from backend.llm.gemini_client import GeminiClient
-from backend.models.intent import Intent
+from backend.llm.gemini_client import GeminiClient, get_gemini_client
+from backend.models.intent import GOAL_INTENTS, Intent
 from backend.models.state import State
 from backend.prompts.fallback_prompt import build_fallback_prompt
 from backend.prompts.system_prompt import build_system_prompt
 from backend.utils.clarification import build_clarification_question
 
-_GOAL_INTENTS = {
-    Intent.ITINERARY_PLANNING,
-    Intent.ATTRACTIONS_RECOMMENDATIONS,
-    Intent.PACKING_LIST,
-    Intent.WEATHER_QUERY,
-    Intent.CURRENCY_CONVERSION,
-}
 
+# Goal-intent resolution table: maps each goal intent to itself (anything else resolves to None).
+_GOAL_LOOKUP: Dict[Optional[Intent], Intent] = {intent: intent for intent in GOAL_INTENTS}
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class FallbackResult:
     message: str
     used_llm: bool
@@ -34,13 +30,11 @@ class FallbackResult:
 class FallbackHandler:
     def __init__(self, client: Optional[GeminiClient] = None, validator: Optional[Validator] = None) -> None:
         # Key line: lazy-init avoids crashing if GEMINI_API_KEY is missing (deterministic fallbacks still work).
-        self._client = client
+        self._client_factory: Callable[[], GeminiClient] = (lambda: client) if client is not None else get_gemini_client
         self.validator = validator or Validator()
 
     def _get_client(self) -> GeminiClient:
-        if self._client is None:
-            self._client = GeminiClient()
-        return self._client
+        return self._client_factory()
 
     def recover(
         self,
@@ -61,8 +55,9 @@ class FallbackHandler:
             q = build_clarification_question(pending)
             return FallbackResult(message=q, used_llm=False, pending_missing_info=pending)
 
-        active_goal = state.last_intent if state.last_intent in _GOAL_INTENTS else None
-        if active_goal is None and (intent_for_flow not in _GOAL_INTENTS):
+        # Key line: the flow's intent wins if it is a goal; otherwise fall back to the session's active goal.
+        goal = _GOAL_LOOKUP.get(intent_for_flow) or _GOAL_LOOKUP.get(state.last_intent)
+        if goal is None:
             return FallbackResult(
                 message="What would you like help with: itinerary, attractions, packing, weather, or currency conversion?",
                 used_llm=False,
@@ -70,19 +65,16 @@ class FallbackHandler:
                 resolved_intent=None,
             )
 
-        goal = intent_for_flow if intent_for_flow in _GOAL_INTENTS else active_goal
-
-        if goal is not None:
-            validation = self.validator.validate(goal, state)
-            if not validation.ok:
-                pending = (validation.missing_info or [])[:1]
-                q = build_clarification_question(pending)
-                return FallbackResult(
-                    message=q,
-                    used_llm=False,
-                    pending_missing_info=pending,
-                    resolved_intent=goal,
-                )
+        validation = self.validator.validate(goal, state)
+        if not validation.ok:
+            pending = (validation.missing_info or [])[:1]
+            q = build_clarification_question(pending)
+            return FallbackResult(
+                message=q,
+                used_llm=False,
+                pending_missing_info=pending,
+                resolved_intent=goal,
+            )
 
         system_prompt = build_system_prompt()
         fallback_prompt = build_fallback_prompt(
@@ -92,8 +84,7 @@ class FallbackHandler:
             recent_messages=recent_messages,
             error=error,
         )
-        full_prompt = f"{system_prompt}\n\n{fallback_prompt}"
-        text = (self._get_client().generate_text(full_prompt) or "").strip()
+        text = (self._get_client().generate_text(fallback_prompt, system=system_prompt) or "").strip()
 
         if not text:
             return FallbackResult(
@@ -5,36 +5,69 @@
 from __future__ import annotations
 
 import re
+import time
+from calendar import monthrange
 from dataclasses import dataclass
 from datetime import date as dt_date
+from functools import lru_cache
+from itertools import islice
 from typing import Optional
 
 import backend.config as config
 from backend.core.decision_logic import DecisionLogic
-from backend.core.fallback_handler import FallbackHandler
+from backend.core.fallback_cache import FallbackCache
+from backend.core.fallback_handler import FallbackHandler, FallbackResult
 from backend.core.state_manager import StateManager
 from backend.core.trust_layer import TrustLayer
-from backend.core.validator import Validator
+from backend.core.validator import ValidationResult, Validator
 from backend.llm.intent_classifier import IntentClassifier
 from backend.llm.response_generator import ResponseGenerator
 from backend.models.decision import Action, Decision
-from backend.models.intent import Intent
+from backend.models.intent import GOAL_INTENTS, Intent
 from backend.models.state import State
 from backend.tools.currency_client import CurrencyClient
 from backend.tools.weather_client import WeatherClient
 from backend.utils.clarification import build_clarification_question
 from backend.utils.weather_rules import mentions_month
 
-_GOAL_INTENTS = {
-    Intent.ITINERARY_PLANNING,
-    Intent.ATTRACTIONS_RECOMMENDATIONS,
-    Intent.PACKING_LIST,
-    Intent.WEATHER_QUERY,
-    Intent.CURRENCY_CONVERSION,
-}
 
-
-@dataclass(frozen=True)
+# Key line: month lengths (incl. leap-year February) come from calendar, memoized per (year, month).
+@lru_cache(maxsize=256)
+def _last_day_of_month(year: int, month: int) -> int:
+    return monthrange(year, month)[1]
+
+
+# Key line: compiled once at import; non-capturing since only "is there a 4-digit year?" matters.
+_YEAR_RE = re.compile(r"\b(?:19|20)\d{2}\b")
+
+# Key line: one C-level scan per text finds every keyword start (the lookahead lets overlapping hits count);
+# the slot is then picked by the priority lists below, same order as the old chain of `in` checks.
+_ASK_SLOT_RE = re.compile(
+    r"(?=(?P<interests>interest)|(?P<budget>budget)|(?P<travelers>who|traveling)|(?P<pace>pace)"
+    r"|(?P<dates_or_duration>month|date|when)|(?P<destination>where|city|country))"
+)
+_ASK_SLOT_PRIORITY = ("interests", "budget", "travelers", "pace", "dates_or_duration", "destination")
+
+_ASK_CURRENCY_RE = re.compile(
+    r"(?=(?P<pair>between|which currencies)|(?P<amount>amount|how much)"
+    r"|(?P<from>from)|(?P<to>to)|(?P<currency>currency))"
+)
+
+# Fixed replies for the deterministic branches of _execute_decision.
+_OUT_OF_SCOPE_MSG = (
+    "I can help with travel planning only (itineraries, attractions, packing, weather, currency conversion). "
+    "What would you like to do?"
+)
+_WEATHER_TOOL_FAILED_MSG = (
+    "I couldn’t fetch weather info right now. "
+    "If you tell me your dates (or month), I can still give general seasonal packing tips."
+)
+_CURRENCY_TOOL_FAILED_MSG = (
+    "I couldn’t fetch the exchange rate right now. "
+    "Try again in a moment, or share the currencies in the format “100 USD to EUR”."
+)
+
+@dataclass(frozen=True, slots=True)
 class TurnResponse:
     session_id: str
     assistant_message: str
@@ -52,6 +85,7 @@ class FlowController:
         currency_client: Optional[CurrencyClient] = None,
         fallback_handler: Optional[FallbackHandler] = None,
         trust_layer: Optional[TrustLayer] = None,
+        fallback_cache: Optional[FallbackCache] = None,
     ) -> None:
         # Key line: dependencies are injectable for testing/mocking.
         self.state_manager = state_manager or StateManager()
@@ -63,67 +97,114 @@ class FlowController:
         self.currency_client = currency_client or CurrencyClient()
         self.fallback_handler = fallback_handler or FallbackHandler()
         self.trust_layer = trust_layer or TrustLayer()
+        self.fallback_cache = fallback_cache or FallbackCache()
 
     def _recent_messages(self, state: State, limit: int = 6) -> list[dict]:
         # Role: compact history format for prompts/classifier.
-        msgs = state.conversation_history[-limit:]
+        history = state.conversation_history
+        msgs = islice(history, max(0, len(history) - limit), None)
         return [{"role": m.role, "content": m.content} for m in msgs]
 
+    def _promote_resolved_goal(self, state: State, resolved_intent: Optional[Intent]) -> None:
+        # Role: a fallback that settled on a goal becomes the current goal for follow-ups.
+        if resolved_intent in GOAL_INTENTS:
+            state.last_intent = resolved_intent
+
     def _infer_pending_from_assistant(self, assistant_text: str, intent: Intent, state: State) -> list[str]:
         # Role: heuristic backup for setting pending_missing_info when LLM asks a question.
         if not assistant_text or not assistant_text.rstrip().endswith("?"):
             return []
 
-        if intent in _GOAL_INTENTS and intent != Intent.CURRENCY_CONVERSION:
+        if intent in GOAL_INTENTS and intent is not Intent.CURRENCY_CONVERSION:
             validation_result = self.validator.validate(intent, state)
             if validation_result.missing_info:
                 return (validation_result.missing_info or [])[:1]
 
-        if intent == Intent.CURRENCY_CONVERSION:
-            low = assistant_text.lower()
-            if "between" in low or "which currencies" in low:
+        # Key line: lowercase once; both keyword scans below reuse it.
+        low = assistant_text.lower()
+
+        if intent is Intent.CURRENCY_CONVERSION:
+            found = {m.lastgroup for m in _ASK_CURRENCY_RE.finditer(low)}
+            if "pair" in found:
                 return ["currency_pair"]
-            if "amount" in low or "how much" in low:
+            if "amount" in found:
                 return ["currency_amount"]
-            if "from" in low and "currency" in low:
-                return ["currency_from"]
-            if "to" in low and "currency" in low:
-                return ["currency_to"]
+            if "currency" in found:
+                if "from" in found:
+                    return ["currency_from"]
+                if "to" in found:
+                    return ["currency_to"]
 
-        low = assistant_text.lower()
-        if "interest" in low:
-            return ["interests"]
-        if "budget" in low:
-            return ["budget"]
-        if "who" in low or "traveling" in low:
-            return ["travelers"]
-        if "pace" in low:
-            return ["pace"]
-        if "month" in low:
-            return ["dates_or_duration"]
-        if "date" in low or "when" in low:
-            return ["dates_or_duration"]
-        if "where" in low or "city" in low or "country" in low:
-            return ["destination"]
+        found = {m.lastgroup for m in _ASK_SLOT_RE.finditer(low)}
+        for slot in _ASK_SLOT_PRIORITY:
+            if slot in found:
+                return [slot]
 
         return []
 
+    def _recover(
+        self,
+        state: State,
+        user_message: str,
+        intent_for_flow: Intent,
+        recent_messages: list[dict],
+        *,
+        error: str,
+    ) -> FallbackResult:
+        # Role: FallbackHandler.recover behind the (optional) disk cache. Only LLM-written replies are cached;
+        # deterministic clarifications are cheap and depend on live state.
+        cache_key = None
+        if self.fallback_cache.enabled:
+            cache_key = FallbackCache.make_key(
+                intent_for_flow, user_message, recent_messages, state.trip_profile.cached_dump(), error
+            )
+            cached = self.fallback_cache.get(cache_key)
+            if cached is not None:
+                resolved = cached.get("resolved_intent")
+                return FallbackResult(
+                    message=cached["message"],
+                    used_llm=False,
+                    pending_missing_info=list(cached.get("pending_missing_info") or []),
+                    resolved_intent=Intent(resolved) if resolved else None,
+                )
+
+        fallback = self.fallback_handler.recover(
+            state=state,
+            user_message=user_message,
+            intent_for_flow=intent_for_flow,
+            recent_messages=recent_messages,
+            error=error,
+        )
+
+        if cache_key is not None and fallback.used_llm:
+            self.fallback_cache.put(
+                cache_key,
+                {
+                    "message": fallback.message,
+                    "pending_missing_info": fallback.pending_missing_info,
+                    "resolved_intent": fallback.resolved_intent.value if fallback.resolved_intent else None,
+                },
+            )
+        return fallback
+
     def _looks_like_full_month_range(self, start_date: dt_date, end_date: dt_date) -> bool:
-        # Role: detect "January (no year)" interpreted as full-month range.
+        # Role: detect "January (no year)" interpreted as full-month range (1st through the month's real last day).
         return (
             start_date is not None
             and end_date is not None
-            and start_date.year == end_date.year
-            and start_date.month == end_date.month
             and start_date.day == 1
-            and end_date.day in {28, 29, 30, 31}
+            and end_date.year == start_date.year
+            and end_date.month == start_date.month
+            and end_date.day == _last_day_of_month(start_date.year, start_date.month)
         )
 
-    def _guardrail_roll_month_without_year_forward(self, user_message: str, state: State) -> None:
+    def _guardrail_roll_month_without_year_forward(
+        self, user_message: str, state: State, today: Optional[dt_date] = None
+    ) -> None:
         # Role: if the classifier produced "full month" dates in the past (month without year),
         # roll them forward by +1 year to keep behavior aligned with "next occurrence" rule.
         msg = user_message or ""
-        has_year = bool(re.search(r"\b(19|20)\d{2}\b", msg))
+        has_year = _YEAR_RE.search(msg) is not None
         if not (mentions_month(msg) and not has_year):
             return
 
@@ -132,7 +213,7 @@ class FlowController:
         if not (start_date and end_date):
             return
 
-        today = dt_date.today()
+        today = today or dt_date.today()
 
         if self._looks_like_full_month_range(start_date, end_date) and end_date < today:
             try:
@@ -156,49 +237,58 @@ class FlowController:
         # 6) TrustLayer guardrails for non-tool outputs (and for tool outputs inside tool branch)
         # 7) Persist assistant message and return
 
+        debug = config.DEBUG
+        # Key line: one date read per turn, shared by the month guardrail, routing and tools.
+        turn_today = dt_date.today()
+
         state = self.state_manager.get_or_create(session_id)
         prev_intent = state.last_intent
         prev_pending = state.pending_missing_info[:]  # NEW: snapshot pending slots for this turn
 
-        recent_for_intent = self._recent_messages(state, limit=6)
+        # Key line: materialize the prompt-history view once per turn (widest window: 8), then slice it.
+        history_view = self._recent_messages(state, limit=8)
+
+        # Key line: classified fresh every turn; short replies ("yes", "more") only make sense with this session's
+        # history, which GeminiClient's prompt-keyed cache already includes in its key.
         intent_result = self.intent_classifier.classify(
             user_message=user_message,
-            recent_messages=recent_for_intent,
+            recent_messages=history_view[-6:],
             pending_missing_info=state.pending_missing_info,
         )
 
-        self.state_manager.add_message(session_id, role="user", content=user_message)
+        # Key line: one clock read covers the user message timestamp and both last-seen bumps of this turn.
+        turn_now = time.time()
+        self.state_manager.add_message(session_id, role="user", content=user_message, now=turn_now)
+        # Same window after the user message is stored (capped like the history itself).
+        history_view.append({"role": "user", "content": user_message})
+        recent_for_response = history_view[-min(8, self.state_manager.max_history_messages) :]
 
         state.trip_profile.apply_updates(intent_result.extracted_updates or {})
-        self._guardrail_roll_month_without_year_forward(user_message, state)
+        self._guardrail_roll_month_without_year_forward(user_message, state, today=turn_today)
 
         intent_for_flow = intent_result.intent
-        active_goal = prev_intent if prev_intent in _GOAL_INTENTS else None
+        active_goal = prev_intent if prev_intent in GOAL_INTENTS else None
 
-        if intent_for_flow == Intent.CONSTRAINTS_UPDATE:
+        if intent_for_flow is Intent.CONSTRAINTS_UPDATE:
             # Key line: follow-ups become part of the current goal, not a separate "constraints" mode.
             intent_for_flow = active_goal or Intent.CLARIFICATION_NEEDED
 
         # Intent bookkeeping
-        if intent_for_flow in _GOAL_INTENTS:
+        if intent_for_flow in GOAL_INTENTS:
             state.last_intent = intent_for_flow
             # NEW: primary_intent tracks "main" flow; currency is an interrupt
-            if intent_for_flow != Intent.CURRENCY_CONVERSION:
+            if intent_for_flow is not Intent.CURRENCY_CONVERSION:
                 state.primary_intent = intent_for_flow
 
-        self.state_manager.increment_turn(state)
+        self.state_manager.increment_turn(state, now=turn_now)
 
         validation = self.validator.validate(intent_for_flow, state)
-        decision = self.decision_logic.decide(intent_for_flow, validation, user_message, state)
+        decision = self.decision_logic.decide(intent_for_flow, validation, user_message, state, today=turn_today)
 
         # Defensive: if decision is missing, use recovery handler.
         if decision is None:
-            fallback = self.fallback_handler.recover(
-                state=state,
-                user_message=user_message,
-                intent_for_flow=intent_for_flow,
-                recent_messages=self._recent_messages(state, limit=8),
-                error="DecisionLogic returned None",
+            fallback = self._recover(
+                state, user_message, intent_for_flow, recent_for_response, error="DecisionLogic returned None"
             )
             assistant_text = fallback.message
 
@@ -208,8 +298,7 @@ class FlowController:
                 else self._infer_pending_from_assistant(assistant_text, intent_for_flow, state)
             )
 
-            if fallback.resolved_intent in _GOAL_INTENTS:
-                state.last_intent = fallback.resolved_intent
+            self._promote_resolved_goal(state, fallback.resolved_intent)
 
             trust = self.trust_layer.apply(
                 intent=intent_for_flow,
@@ -218,7 +307,7 @@ class FlowController:
                 user_message=user_message,
             )
 
-            if config.DEBUG:
+            if debug:
                 if trust.flagged:
                     print("[TRUST_LAYER] flagged:", trust.reasons)
                 print("FINAL (after trust):", trust.text)
@@ -228,55 +317,40 @@ class FlowController:
             return TurnResponse(session_id=session_id, assistant_message=assistant_text)
 
         # Update pending clarification slot (single-field loop).
-        if decision.action == Action.ASK_CLARIFICATION:
-            state.pending_missing_info = (decision.missing_info or [])[:1]
+        if decision.action is Action.ASK_CLARIFICATION:
+            state.pending_missing_info = list(decision.missing_info[:1])
         else:
             # NEW: keep currency_amount pending if we intentionally answered a non-currency turn
-            if prev_pending == ["currency_amount"] and intent_for_flow != Intent.CURRENCY_CONVERSION:
+            if prev_pending == ["currency_amount"] and intent_for_flow is not Intent.CURRENCY_CONVERSION:
                 state.pending_missing_info = prev_pending
             else:
                 state.pending_missing_info = []
 
-        if config.DEBUG:
-            print("\n--- FLOW DEBUG ---")
-            print("SESSION:", session_id)
-            print("USER MESSAGE:", user_message)
-            print("INTENT (raw):", intent_result.intent)
-            print("PREV last_intent:", prev_intent)
-            print("INTENT (for flow):", intent_for_flow)
-            print("TURN COUNT:", state.turn_count)
-            print("STATE last_intent:", state.last_intent)
-            # primary_intent may be None if State model doesn't have it yet or never set
-            if hasattr(state, "primary_intent"):
-                print("STATE primary_intent:", getattr(state, "primary_intent"))
-            print("TRIP PROFILE:", state.trip_profile.model_dump())
-            print("VALIDATION OK:", validation.ok)
-            print("VALIDATION missing_info:", validation.missing_info)
-            print("VALIDATION problems:", validation.problems)
-            print("DECISION action:", decision.action)
-            print("DECISION missing_info:", decision.missing_info)
-            print("DECISION tool_name:", decision.tool_name)
-            print("DECISION notes:", decision.notes)
-            print("PENDING missing_info:", state.pending_missing_info)
-            print("------------------\n")
+        if debug:
+            self._print_turn_debug(
+                session_id=session_id,
+                user_message=user_message,
+                raw_intent=intent_result.intent,
+                prev_intent=prev_intent,
+                intent_for_flow=intent_for_flow,
+                state=state,
+                validation=validation,
+                decision=decision,
+            )
 
         try:
-            assistant_text = self._execute_decision(decision, state, intent_for_flow, user_message)
+            assistant_text = self._execute_decision(
+                decision, state, intent_for_flow, user_message, recent_for_response, today=turn_today
+            )
             if not assistant_text or not assistant_text.strip():
                 raise RuntimeError("Empty assistant_text")
         except Exception as e:
-            if config.DEBUG:
+            if debug:
                 print("\n!!! EXECUTION ERROR !!!")
                 print(repr(e))
                 print("!!! END ERROR !!!\n")
 
-            fallback = self.fallback_handler.recover(
-                state=state,
-                user_message=user_message,
-                intent_for_flow=intent_for_flow,
-                recent_messages=self._recent_messages(state, limit=8),
-                error=repr(e),
-            )
+            fallback = self._recover(state, user_message, intent_for_flow, recent_for_response, error=repr(e))
             assistant_text = fallback.message
 
             state.pending_missing_info = (
@@ -285,25 +359,24 @@ class FlowController:
                 else self._infer_pending_from_assistant(assistant_text, intent_for_flow, state)
             )
 
-            if fallback.resolved_intent in _GOAL_INTENTS:
-                state.last_intent = fallback.resolved_intent
+            self._promote_resolved_goal(state, fallback.resolved_intent)
 
         # Key line: apply TrustLayer to all non-tool responses (tools already pass tool_data into TrustLayer).
-        if decision.action != Action.CALL_TOOL:
+        if decision.action is not Action.CALL_TOOL:
             trust = self.trust_layer.apply(
                 intent=intent_for_flow,
                 assistant_text=assistant_text,
                 tool_data=None,
                 user_message=user_message,
             )
-            if config.DEBUG:
+            if debug:
                 if trust.flagged:
                     print("[TRUST_LAYER] flagged:", trust.reasons)
                 print("FINAL (after trust):", trust.text)
             assistant_text = trust.text
 
         # If LLM asks a question, infer which slot it asked for.
-        if decision.action == Action.GENERATE_RESPONSE and not state.pending_missing_info:
+        if decision.action is Action.GENERATE_RESPONSE and not state.pending_missing_info:
             state.pending_missing_info = self._infer_pending_from_assistant(
                 assistant_text, intent_for_flow, state
             )
@@ -311,25 +384,61 @@ class FlowController:
         self.state_manager.add_message(session_id, role="assistant", content=assistant_text)
         return TurnResponse(session_id=session_id, assistant_message=assistant_text)
 
-    def _execute_decision(self, decision: Decision, state: State, intent: Intent, user_message: str) -> str:
+    def _print_turn_debug(
+        self,
+        *,
+        session_id: str,
+        user_message: str,
+        raw_intent: Intent,
+        prev_intent: Optional[Intent],
+        intent_for_flow: Intent,
+        state: State,
+        validation: ValidationResult,
+        decision: Decision,
+    ) -> None:
+        # Role: per-turn FLOW DEBUG dump. Only called under the DEBUG guard, so none of this runs otherwise.
+        print("\n--- FLOW DEBUG ---")
+        print("SESSION:", session_id)
+        print("USER MESSAGE:", user_message)
+        print("INTENT (raw):", raw_intent)
+        print("PREV last_intent:", prev_intent)
+        print("INTENT (for flow):", intent_for_flow)
+        print("TURN COUNT:", state.turn_count)
+        print("STATE last_intent:", state.last_intent)
+        print("STATE primary_intent:", state.primary_intent)
+        print("TRIP PROFILE:", state.trip_profile.cached_dump())
+        print("VALIDATION OK:", validation.ok)
+        print("VALIDATION missing_info:", validation.missing_info)
+        print("VALIDATION problems:", validation.problems)
+        print("DECISION action:", decision.action)
+        print("DECISION missing_info:", decision.missing_info)
+        print("DECISION tool_name:", decision.tool_name)
+        print("DECISION notes:", decision.notes)
+        print("PENDING missing_info:", state.pending_missing_info)
+        print("------------------\n")
+
+    def _execute_decision(
+        self,
+        decision: Decision,
+        state: State,
+        intent: Intent,
+        user_message: str,
+        recent_for_response: list[dict],
+        today: Optional[dt_date] = None,
+    ) -> str:
         # 1) Deterministic responses for out-of-scope / clarifications
         # 2) Tool branch (weather/currency) -> tool call -> response generation -> TrustLayer with tool_data
         # 3) Default: LLM response generation
 
-        if decision.action == Action.OUT_OF_SCOPE_RESPONSE:
-            return (
-                "I can help with travel planning only (itineraries, attractions, packing, weather, currency conversion). "
-                "What would you like to do?"
-            )
+        if decision.action is Action.OUT_OF_SCOPE_RESPONSE:
+            return _OUT_OF_SCOPE_MSG
 
-        if decision.action == Action.ASK_CLARIFICATION:
+        if decision.action is Action.ASK_CLARIFICATION:
             return build_clarification_question(decision.missing_info)
 
-        if decision.action == Action.CALL_TOOL:
-            recent_for_response = self._recent_messages(state, limit=8)
-
+        if decision.action is Action.CALL_TOOL:
             if decision.tool_name == "weather":
-                tool_result = self.weather_client.get_weather(state.trip_profile)
+                tool_result = self.weather_client.get_weather(state.trip_profile, today=today)
 
                 if tool_result.ok:
                     text = self.response_generator.generate(
@@ -350,10 +459,7 @@ class FlowController:
                         print("FINAL (after trust):", trust.text)
                     return trust.text
 
-                return (
-                    "I couldn’t fetch weather info right now. "
-                    "If you tell me your dates (or month), I can still give general seasonal packing tips."
-                )
+                return _WEATHER_TOOL_FAILED_MSG
 
             if decision.tool_name == "currency":
                 payload = decision.tool_payload or {}
@@ -386,8 +492,9 @@ class FlowController:
                     )
 
                     # NEW: currency is an interrupt; return control to primary goal (e.g., itinerary).
-                    if state.primary_intent is not None:
-                        state.last_intent = state.primary_intent
+                    primary_intent = state.primary_intent
+                    if primary_intent is not None:
+                        state.last_intent = primary_intent
 
                     if config.DEBUG:
                         if trust.flagged:
@@ -395,14 +502,12 @@ class FlowController:
                         print("FINAL (after trust):", trust.text)
                     return trust.text
 
-                return (
-                    "I couldn’t fetch the exchange rate right now. "
-                    "Try again in a moment, or share the currencies in the format “100 USD to EUR”."
-                )
+                return _CURRENCY_TOOL_FAILED_MSG
 
             return "I can’t run that tool right now. What would you like to do next?"
 
-        recent_for_response = self._recent_messages(state, limit=8)
+        # Key line: no answer cache here; the reply depends on the recent history, and GeminiClient's
+        # prompt-keyed cache (which includes that history) already serves genuinely repeated prompts.
         return self.response_generator.generate(
             intent=intent,
             state=state,
@@ -3,8 +3,9 @@
 
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
-from typing import Dict
+import time
+from collections import OrderedDict, deque
+from typing import Optional
 
 from backend.models.message import Message
 from backend.models.state import State
@@ -12,40 +13,57 @@ from backend.models.state import State
 
 class StateManager:
     def __init__(self, max_history_messages: int = 12, session_ttl_minutes: int = 60) -> None:
-        self._states: Dict[str, State] = {}
+        # Key line: insertion order == last-touched order (oldest first), so expiry only scans the stale prefix.
+        self._states: OrderedDict[str, State] = OrderedDict()
         self._max_history_messages = max_history_messages
-        self._ttl = timedelta(minutes=session_ttl_minutes)
+        self._ttl_seconds = session_ttl_minutes * 60.0
+
+    @property
+    def max_history_messages(self) -> int:
+        return self._max_history_messages
 
     def get_or_create(self, session_id: str) -> State:
         # Reuse existing state or initialize a fresh one.
         state = self._states.get(session_id)
         if state is None:
             state = State(session_id=session_id)
+            # Key line: bounded history; appends past the cap drop the oldest message in O(1).
+            state.conversation_history = deque(maxlen=self._max_history_messages)
             self._states[session_id] = state
         return state
 
-    def add_message(self, session_id: str, role: str, content: str) -> State:
+    def add_message(
+        self, session_id: str, role: str, content: str, now: Optional[float] = None
+    ) -> State:
         # 1) Append message
         # 2) Update last-seen timestamp
-        # 3) Trim to last N messages (keeps prompts small + bounded memory)
+        # 3) History is a deque(maxlen=N), so the append itself keeps the last N messages
+        # Key line: callers may pass one `now` for several calls in the same turn (one clock read, no skew).
+        now = now or time.time()
         state = self.get_or_create(session_id)
-        state.conversation_history.append(Message(role=role, content=content))
-        state.updated_at = datetime.now(timezone.utc)
-
-        if len(state.conversation_history) > self._max_history_messages:
-            state.conversation_history = state.conversation_history[-self._max_history_messages :]
-
+        state.conversation_history.append(Message(role=role, content=content, timestamp=now))
+        self._touch(state, now)
         return state
 
-    def increment_turn(self, state: State) -> None:
+    def increment_turn(self, state: State, now: Optional[float] = None) -> None:
         # Key line: turn_count is useful for debugging and future policies (rate-limits, etc.).
         state.turn_count += 1
-        state.updated_at = datetime.now(timezone.utc)
+        self._touch(state, now or time.time())
+
+    def _touch(self, state: State, now: float) -> None:
+        # Key line: every updated_at bump also moves the session to the end, keeping the dict sorted by last-seen.
+        state.updated_at = now
+        self._states.move_to_end(state.session_id)
 
     def cleanup_expired(self) -> int:
         # Role: drop inactive sessions to avoid unbounded growth (best for long-running servers).
-        now = datetime.now(timezone.utc)
-        to_delete = [sid for sid, st in self._states.items() if (now - st.updated_at) > self._ttl]
-        for sid in to_delete:
+        # Key line: sessions are ordered oldest-first, so stop at the first one that is still active.
+        now = time.time()
+        deleted = 0
+        while self._states:
+            sid, st = next(iter(self._states.items()))
+            if (now - st.updated_at) <= self._ttl_seconds:
+                break
             del self._states[sid]
-        return len(to_delete)
+            deleted += 1
+        return deleted
@@ -10,13 +10,69 @@ from typing import Any, Dict, Optional
 from backend.models.intent import Intent
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TrustResult:
     text: str
     flagged: bool
     reasons: list[str]
 
 
+@dataclass(frozen=True, slots=True)
+class UserSignals:
+    # Role: what the user asked for (live / exact daily / specific date). Depends only on user_message,
+    # so it is computed once per apply (or ahead of time via precheck_user) instead of inside each check.
+    requested_live: bool
+    requested_exact_daily: bool
+    specific_request: bool
+    # Key line: the lowercased user message, built once here and reused by the safe weather replies.
+    user_low: str
+
+
+# Key lines: each detector's patterns are joined into one alternation compiled once at import,
+# so a message is scanned in a single pass instead of once per pattern.
+_FORECAST_NUMBER_RE = re.compile(
+    "|".join(
+        f"(?:{p})"
+        for p in (
+            r"\b-?\d{1,2}\s*°\s*c\b",
+            r"\b-?\d{1,3}\s*°\s*f\b",
+            r"\b\d{1,3}\s*mm\b",
+            r"\b\d{1,3}\s*km\/h\b",
+            r"\b\d{1,3}\s*kmh\b",
+            r"\bhighs?\s+of\s+\d{1,2}\b",
+            r"\blows?\s+of\s+\d{1,2}\b",
+        )
+    )
+)
+
+_CURRENCY_NUMBER_RE = re.compile(
+    "|".join(
+        f"(?:{p})"
+        for p in (
+            r"\brate\s+of\s+\d+(\.\d+)?\b",
+            r"\b\d+(\.\d+)?\s*(usd|eur|ils|gbp|jpy)\b",
+            r"\b(usd|eur|ils|gbp|jpy)\s*\d+(\.\d+)?\b",
+            r"[$€₪]\s*\d+(\.\d+)?",
+            r"\bconverts\s+to\s+\d+(\.\d+)?\b",
+        )
+    ),
+    re.IGNORECASE,
+)
+
+# Key lines: "exchange rate ... <digit on the same line>" is checked by _mentions_exchange_rate_number instead of
+# r"\bexchange\s+rate\b.*\d", whose ".*" rescans to the end of the line for every mention (quadratic on
+# long digit-free text).
+_EXCHANGE_RATE_RE = re.compile(r"\bexchange\s+rate\b", re.IGNORECASE)
+_DIGIT_RE = re.compile(r"\d")
+# Key line: "```tool_code" and bare "```" fences removed in one pass; ResponseGenerator uses the same pattern.
+TOOL_CODE_FENCE_RE = re.compile(r"```(?:tool_code)?")
+
+# Key lines: every pattern above needs one of these substrings, so texts without any of them skip the regex.
+# ("ı" and "ſ" are listed because IGNORECASE folds them onto "i" and "s".)
+_FORECAST_NUMBER_HINTS = ("°", "mm", "km", "high", "low")
+_CURRENCY_NUMBER_HINTS = ("rate", "converts", "usd", "eur", "ils", "gbp", "jpy", "$", "€", "₪", "ı", "ſ")
+
+
 class TrustLayer:
     _REALTIME_CLAIMS = (
         "real-time",
@@ -31,6 +87,19 @@ class TrustLayer:
         "according to google",
     )
 
+    _SPECIFIC_REQUEST_MARKERS = (
+        "exact",
+        "daily",
+        "each day",
+        "day-by-day",
+        "right now",
+        "live",
+        "currently",
+        "today",
+        "tomorrow",
+        "on ",
+    )
+
     def apply(
         self,
         *,
@@ -38,6 +107,7 @@ class TrustLayer:
         assistant_text: str,
         tool_data: Optional[Dict[str, Any]] = None,
         user_message: Optional[str] = None,
+        user_signals: Optional[UserSignals] = None,
     ) -> TrustResult:
         # 1) Remove any leaked tool-code patterns
         # 2) Remove/soften "real-time" claims unless explicitly requested in live-weather scenarios
@@ -49,44 +119,58 @@ class TrustLayer:
             return TrustResult(text=text, flagged=False, reasons=[])
 
         reasons: list[str] = []
+        signals = user_signals or self.precheck_user(user_message)
 
-        if self._looks_like_tool_code(text):
+        # Key line: lowercase once; the helpers below take the lowered text and only re-lower after a rewrite.
+        low = text.lower()
+
+        if self._looks_like_tool_code(low):
             reasons.append("tool_code_leak")
             text = self._strip_tool_code_fences(text)
+            low = text.lower()
 
-        low = text.lower()
         realtime_hit = any(p in low for p in self._REALTIME_CLAIMS)
 
-        if realtime_hit and not (intent == Intent.WEATHER_QUERY and self._user_requested_live(user_message or "")):
+        if realtime_hit and not (intent == Intent.WEATHER_QUERY and signals.requested_live):
             reasons.append("realtime_claim")
             text = self._rewrite_no_realtime_claim(text)
+            low = text.lower()
 
         if intent == Intent.WEATHER_QUERY:
-            u = user_message or ""
+            u = signals.user_low
 
-            if tool_data is None and self._user_requested_exact_daily(u):
+            if tool_data is None and signals.requested_exact_daily:
                 reasons.append("exact_daily_weather_without_tool")
                 text = self._safe_weather_without_tool(u)
 
-            elif self._user_requested_live(u):
+            elif signals.requested_live:
                 reasons.append("live_weather_request")
                 text = self._safe_live_weather_response(tool_data)
 
             elif tool_data is None:
-                if self._contains_specific_forecast_numbers(text, u):
+                if self._contains_specific_forecast_numbers(low, signals):
                     reasons.append("weather_numbers_without_tool")
                     text = self._safe_weather_without_tool(u)
 
         if intent == Intent.CURRENCY_CONVERSION and tool_data is None:
-            if self._contains_currency_rate_or_conversion(text):
+            if self._contains_currency_rate_or_conversion(low):
                 reasons.append("currency_numbers_without_tool")
                 text = self._safe_currency_without_tool()
 
         return TrustResult(text=text, flagged=bool(reasons), reasons=reasons)
 
-    def _looks_like_tool_code(self, text: str) -> bool:
-        # Role: detect LLM leaking internal "tool_code" or pseudo-calls.
-        low = text.lower()
+    def precheck_user(self, user_message: Optional[str]) -> UserSignals:
+        # Role: user-side half of the checks; needs no assistant text, so callers may run it before generation.
+        u = (user_message or "").lower()
+        return UserSignals(
+            requested_live=self._user_requested_live(u),
+            requested_exact_daily=self._user_requested_exact_daily(u),
+            specific_request=any(m in u for m in self._SPECIFIC_REQUEST_MARKERS),
+            user_low=u,
+        )
+
+    def _looks_like_tool_code(self, low: str) -> bool:
+        # Role: detect LLM leaking internal "tool_code" or pseudo-calls (expects lowercased text).
         return (
             "```tool_code" in low
             or "currency_conversion(" in low
@@ -95,19 +179,32 @@ class TrustLayer:
         )
 
     def _strip_tool_code_fences(self, text: str) -> str:
-        return text.replace("```tool_code", "").replace("```", "").strip()
+        return TOOL_CODE_FENCE_RE.sub("", text).strip()
 
     def _rewrite_no_realtime_claim(self, text: str) -> str:
-        # Key line: replaces "I checked online" style claims with a neutral phrase.
-        cleaned = text
-        for p in self._REALTIME_CLAIMS:
-            cleaned = re.sub(re.escape(p), "based on available info", cleaned, flags=re.IGNORECASE)
-        return cleaned.strip()
+        # Key line: replaces "I checked online" style claims with a neutral phrase (one pass over the text).
+        return _REALTIME_CLAIM_RE.sub("based on available info", text).strip()
 
-    def _contains_specific_forecast_numbers(self, text: str, user_message: str = "") -> bool:
+    def _contains_specific_forecast_numbers(self, low: str, signals: UserSignals) -> bool:
         # Role: detect "forecast-like" numeric claims (°C, mm, wind) that look too specific for seasonal guidance.
-        low = text.lower()
-        user_low = (user_message or "").lower()
+        # `low` is the already-lowercased assistant text.
+        # Key line: cheapest decisive check first; most replies have no weather numbers at all.
+        if not any(h in low for h in _FORECAST_NUMBER_HINTS) or _FORECAST_NUMBER_RE.search(low) is None:
+            return False
+
+        strict = signals.specific_request
+
+        forecast_claim_markers = (
+            "on ",
+            "tomorrow",
+            "today",
+            "this weekend",
+            "next week",
+            "expect a high of",
+            "expect a low of",
+        )
+        if not (strict or any(m in low for m in forecast_claim_markers)):
+            return False
 
         seasonal_markers = (
             "typical",
@@ -126,69 +223,35 @@ class TrustLayer:
             "between",
         )
 
-        if any(m in low for m in seasonal_markers) and not self._user_requested_exact_daily(user_message):
-            return False
-
-        specific_request_markers = (
-            "exact",
-            "daily",
-            "each day",
-            "day-by-day",
-            "right now",
-            "live",
-            "currently",
-            "today",
-            "tomorrow",
-            "on ",
-        )
-        strict = any(m in user_low for m in specific_request_markers)
+        # Seasonal phrasing is fine unless the user explicitly asked for exact daily numbers.
+        return signals.requested_exact_daily or not any(m in low for m in seasonal_markers)
 
-        patterns = [
-            r"\b-?\d{1,2}\s*°\s*c\b",
-            r"\b-?\d{1,3}\s*°\s*f\b",
-            r"\b\d{1,3}\s*mm\b",
-            r"\b\d{1,3}\s*km\/h\b",
-            r"\b\d{1,3}\s*kmh\b",
-            r"\bhighs?\s+of\s+\d{1,2}\b",
-            r"\blows?\s+of\s+\d{1,2}\b",
-        ]
-
-        has_numbers = any(re.search(p, low) for p in patterns)
-
-        forecast_claim_markers = (
-            "on ",
-            "tomorrow",
-            "today",
-            "this weekend",
-            "next week",
-            "expect a high of",
-            "expect a low of",
-        )
-        sounds_like_forecast = any(m in low for m in forecast_claim_markers)
-
-        return bool(has_numbers and (strict or sounds_like_forecast))
-
-    def _contains_currency_rate_or_conversion(self, text: str) -> bool:
+    def _contains_currency_rate_or_conversion(self, low: str) -> bool:
         # Role: detect conversions/rates (e.g., "rate of 0.84", "100 USD converts to ...") without tool grounding.
-        if not text:
+        # `low` is the already-lowercased assistant text.
+        if not low:
             return False
 
-        low = text.lower()
-
-        patterns = [
-            r"\brate\s+of\s+\d+(\.\d+)?\b",
-            r"\b\d+(\.\d+)?\s*(usd|eur|ils|gbp|jpy)\b",
-            r"\b(usd|eur|ils|gbp|jpy)\s*\d+(\.\d+)?\b",
-            r"[$€₪]\s*\d+(\.\d+)?",
-            r"\bconverts\s+to\s+\d+(\.\d+)?\b",
-            r"\bexchange\s+rate\b.*\d",
-        ]
-
-        return any(re.search(p, low, flags=re.IGNORECASE) for p in patterns)
-
-    def _safe_weather_without_tool(self, user_message: str) -> str:
+        if not any(h in low for h in _CURRENCY_NUMBER_HINTS):
+            return False
+        return _CURRENCY_NUMBER_RE.search(low) is not None or self._mentions_exchange_rate_number(low)
+
+    def _mentions_exchange_rate_number(self, low: str) -> bool:
+        # Role: linear-time "exchange rate" followed by a digit later on the same line.
+        # Key line: once a mention finds no digit before its line end, later mentions ending before it can't either.
+        checked_until = -1
+        for m in _EXCHANGE_RATE_RE.finditer(low):
+            if m.end() <= checked_until:
+                continue
+            line_end = low.find("\n", m.end())
+            checked_until = len(low) if line_end == -1 else line_end
+            if _DIGIT_RE.search(low, m.end(), checked_until):
+                return True
+        return False
+
+    def _safe_weather_without_tool(self, u: str) -> str:
         # Role: standard safe response when we cannot use weather tool data.
-        u = (user_message or "").lower()
+        # `u` is the lowercased user message (UserSignals.user_low).
 
         if any(k in u for k in ("right now", "live", "currently", "today")):
             return (
@@ -233,8 +296,8 @@ class TrustLayer:
             "Please send it like: **“100 USD to EUR”** (amount + from + to)."
         )
 
-    def _user_requested_exact_daily(self, user_message: str) -> bool:
-        u = (user_message or "").lower()
+    def _user_requested_exact_daily(self, u: str) -> bool:
+        # Key line: `u` is the lowercased user message from precheck_user.
         triggers = (
             "exact daily",
             "day-by-day",
@@ -251,8 +314,8 @@ class TrustLayer:
         )
         return any(t in u for t in triggers)
 
-    def _user_requested_live(self, user_message: str) -> bool:
-        u = (user_message or "").lower()
+    def _user_requested_live(self, u: str) -> bool:
+        # Key line: `u` is the lowercased user message from precheck_user.
         triggers = ("right now", "live", "currently", "as of now", "exact temperature", "0.1")
         return any(t in u for t in triggers)
 
@@ -281,3 +344,7 @@ class TrustLayer:
             "I can’t guarantee a *live right-now* weather reading without calling the weather API.\n\n"
             "If you confirm the city (e.g., Paris) I can fetch today’s forecast from the tool."
         )
+
+
+# Key line: one alternation (in _REALTIME_CLAIMS order) replaces the per-claim re.sub loop.
+_REALTIME_CLAIM_RE = re.compile("|".join(re.escape(p) for p in TrustLayer._REALTIME_CLAIMS), re.IGNORECASE)
@@ -10,7 +10,7 @@ from backend.models.intent import Intent
 from backend.models.state import State
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ValidationResult:
     ok: bool
     missing_info: List[str]
@@ -1,11 +1,14 @@
 # Role: Minimal wrapper around Gemini API. Centralizes model name, temperature, and error handling,
-# so the rest of the code calls a single method: generate_text(prompt).
+# so the rest of the code calls a single method: generate_text(prompt, system=None).
 
 import os
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Dict, Optional
 
 from google import genai
 
+import backend.config as config
+
 
 class GeminiClient:
     def __init__(
@@ -23,21 +26,44 @@ class GeminiClient:
 
         self.model_name = model or os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
         self.temperature = temperature
+        # Key line: the generation config never changes per client, so build it once (not per call).
+        self._generate_config = {"temperature": temperature}
+        # Key line: one config per distinct (static) system instruction, also built once.
+        self._system_configs: Dict[str, Dict[str, Any]] = {}
+        # Key line: model and temperature are fixed per client, so (prompt, system) alone keys the reply cache.
+        # Failures raise and are never cached; GEMINI_CACHE_OFF=1 disables caching (e.g., while tuning prompts).
+        self._generate = (
+            self._generate_uncached
+            if config.env_flag("GEMINI_CACHE_OFF")
+            else lru_cache(maxsize=256)(self._generate_uncached)
+        )
 
         self.client = genai.Client(api_key=self.api_key)
 
-    def generate_text(self, prompt: str) -> str:
+    def generate_text(self, prompt: str, system: Optional[str] = None) -> str:
         # 1) Validate prompt
-        # 2) Call Gemini (single text completion)
+        # 2) Call Gemini (single text completion; optional static system instruction)
         # 3) Validate non-empty response
         if not prompt or not prompt.strip():
             raise ValueError("Prompt must be non-empty.")
 
+        return self._generate(prompt, system)
+
+    def _generate_uncached(self, prompt: str, system: Optional[str] = None) -> str:
+        # Key line: the static system text goes in system_instruction, so every request shares the same prefix
+        # (provider-side prompt caching) instead of re-sending it inside the per-turn prompt.
+        if system is None:
+            generate_config = self._generate_config
+        else:
+            generate_config = self._system_configs.get(system)
+            if generate_config is None:
+                generate_config = {**self._generate_config, "system_instruction": system}
+                self._system_configs[system] = generate_config
         try:
             resp = self.client.models.generate_content(
                 model=self.model_name,
                 contents=prompt,
-                config={"temperature": self.temperature},
+                config=generate_config,
             )
         except Exception as e:
             raise RuntimeError(f"Gemini API call failed: {e}") from e
@@ -47,3 +73,10 @@ class GeminiClient:
             raise RuntimeError("Gemini returned an empty response.")
 
         return text.strip()
+
+
+@lru_cache(maxsize=1)
+def get_gemini_client() -> GeminiClient:
+    # Key line: one shared client per process (single genai HTTP session), reused by every component.
+    # Failures are not cached, so a missing GEMINI_API_KEY still raises on each attempt.
+    return GeminiClient()
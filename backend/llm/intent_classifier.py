@@ -10,12 +10,38 @@ from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple
 
 import backend.config as config
-from backend.llm.gemini_client import GeminiClient
+from backend.llm.gemini_client import GeminiClient, get_gemini_client
 from backend.models.intent import Intent
 from backend.prompts.intent_prompt import build_intent_prompt
-
-
-@dataclass(frozen=True)
+from backend.utils.currency import parse_exact_currency_query
+
+# Key lines: patterns are compiled once at import (no per-call re cache lookup).
+_CODE_FENCE_LEAD_RE = re.compile(r"^\s*```(?:json)?\s*", re.IGNORECASE)
+_CODE_FENCE_TAIL_RE = re.compile(r"\s*```\s*$")
+_CURRENCY_PAIR_RE = re.compile(r"\b[A-Z]{3}\s*(?:TO|->|-|/)\s*[A-Z]{3}\b")
+
+_INTENT_BY_VALUE = {intent.value: intent for intent in Intent}
+
+_GENERIC_HELP_PHRASES = frozenset(
+    {
+        "help",
+        "help me",
+        "i need help",
+        "need help",
+        "not sure",
+        "not sure what to ask",
+        "what can you do",
+        "what do you do",
+        "how can you help",
+        "can you help",
+        "please help",
+        "pls help",
+    }
+)
+_GENERIC_HELP_MAX_LEN = max(map(len, _GENERIC_HELP_PHRASES))
+
+
+@dataclass(frozen=True, slots=True)
 class IntentResult:
     intent: Intent
     confidence: float
@@ -35,7 +61,7 @@ class IntentClassifier:
     """
 
     def __init__(self, client: Optional[GeminiClient] = None) -> None:
-        self.client = client or GeminiClient()
+        self.client = client or get_gemini_client()
 
     def classify(
         self,
@@ -49,6 +75,11 @@ class IntentClassifier:
         # 4) Apply "pending slot" overrides (prevents drift in clarification loops)
         # 5) Return structured IntentResult
 
+        # Key line: a bare "{amount} {CCY} to {CCY}" message is unambiguous, so it skips the LLM round-trip.
+        shortcut = self._currency_shortcut(user_message)
+        if shortcut is not None:
+            return shortcut
+
         prompt = build_intent_prompt(
             user_message,
             recent_messages=recent_messages,
@@ -57,7 +88,9 @@ class IntentClassifier:
 
         raw = self.client.generate_text(prompt)
 
-        if config.DEBUG:
+        debug = config.DEBUG
+
+        if debug:
             print("\n--- INTENT CLASSIFIER ---")
             print("USER MESSAGE:", user_message)
             if recent_messages:
@@ -71,7 +104,7 @@ class IntentClassifier:
         if not parsed:
             return self._fallback(raw)
 
-        if parse_meta.get("repaired") and config.DEBUG:
+        if parse_meta.get("repaired") and debug:
             print(
                 "WARNING: IntentClassifier received non-strict JSON output "
                 f"(repaired={parse_meta})."
@@ -107,7 +140,7 @@ class IntentClassifier:
                         pass
                     else:
                         if intent != Intent.CURRENCY_CONVERSION:
-                            if config.DEBUG:
+                            if debug:
                                 print(
                                     f"OVERRIDE: intent {intent} -> CURRENCY_CONVERSION (pending={pending})"
                                 )
@@ -115,32 +148,32 @@ class IntentClassifier:
                             confidence = max(confidence, 0.6)
                 else:
                     if intent != Intent.CURRENCY_CONVERSION:
-                        if config.DEBUG:
+                        if debug:
                             print(f"OVERRIDE: intent {intent} -> CURRENCY_CONVERSION (pending={pending})")
                         intent = Intent.CURRENCY_CONVERSION
                         confidence = max(confidence, 0.6)
 
                 # Wrong-type follow-ups: user provides amount when we need pair (and vice-versa).
                 if pending == "currency_pair" and self._looks_like_amount_only(user_message):
-                    if config.DEBUG:
+                    if debug:
                         print("OVERRIDE: still missing currency_pair (user provided amount-only)")
                     missing_info = ["currency_pair"]
 
                 if pending == "currency_amount" and self._looks_like_currency_pair(user_message):
-                    if config.DEBUG:
+                    if debug:
                         print("OVERRIDE: still missing currency_amount (user provided pair-only)")
                     missing_info = ["currency_amount"]
 
         # Guardrail: generic help stays in-scope and goes to goal selection.
         if intent == Intent.OUT_OF_SCOPE and self._looks_like_generic_help(user_message):
-            if config.DEBUG:
+            if debug:
                 print("OVERRIDE: OUT_OF_SCOPE -> CLARIFICATION_NEEDED (generic help message)")
             intent = Intent.CLARIFICATION_NEEDED
             confidence = max(confidence, 0.6)
             missing_info = []
             extracted_updates = extracted_updates or {}
 
-        if config.DEBUG:
+        if debug:
             print("PARSED INTENT:", intent)
             print("EXTRACTED UPDATES:", extracted_updates)
             print("------------------------\n")
@@ -153,6 +186,23 @@ class IntentClassifier:
             raw_text=raw,
         )
 
+    def _currency_shortcut(self, user_message: str) -> Optional[IntentResult]:
+        # Role: deterministic classification for whole-message conversions; DecisionLogic re-parses the
+        # amount/pair from the message itself, so no extracted_updates are needed.
+        if parse_exact_currency_query(user_message) is None:
+            return None
+        if config.DEBUG:
+            print("\n--- INTENT CLASSIFIER ---")
+            print("USER MESSAGE:", user_message)
+            print("SHORTCUT: currency_conversion (no LLM call)")
+        return IntentResult(
+            intent=Intent.CURRENCY_CONVERSION,
+            confidence=1.0,
+            extracted_updates={},
+            missing_info=[],
+            raw_text="",
+        )
+
     def _strip_code_fences(self, text: str) -> str:
         # Role: remove markdown fences if model incorrectly wrapped JSON.
         if not text:
@@ -160,8 +210,8 @@ class IntentClassifier:
         t = text.strip()
 
         if t.startswith("```"):
-            t = re.sub(r"^\s*```(?:json)?\s*", "", t, flags=re.IGNORECASE)
-            t = re.sub(r"\s*```\s*$", "", t)
+            t = _CODE_FENCE_LEAD_RE.sub("", t)
+            t = _CODE_FENCE_TAIL_RE.sub("", t)
         return t.strip()
 
     def _try_parse_json(self, text: str) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
@@ -170,12 +220,16 @@ class IntentClassifier:
         # 3) extract {...} substring as last attempt
         raw = (text or "").strip()
 
-        try:
-            return json.loads(raw), {"repaired": False, "method": "strict"}
-        except json.JSONDecodeError:
-            pass
+        # Key line: only an object can pass the contract, so skip the strict parse (and its exception)
+        # for fenced/prefixed output and go straight to the repairs.
+        if raw.startswith("{"):
+            try:
+                return json.loads(raw), {"repaired": False, "method": "strict"}
+            except json.JSONDecodeError:
+                pass
 
-        cleaned = self._strip_code_fences(raw)
+        # Key line: raw is already stripped, so without a leading fence there is nothing to clean.
+        cleaned = self._strip_code_fences(raw) if raw.startswith("```") else raw
         if cleaned != raw:
             try:
                 return json.loads(cleaned), {"repaired": True, "method": "stripped_fences"}
@@ -194,12 +248,8 @@ class IntentClassifier:
         return None, {"repaired": False, "method": "failed"}
 
     def _parse_intent(self, value: Any) -> Optional[Intent]:
-        if not isinstance(value, str):
-            return None
-        try:
-            return Intent(value)
-        except ValueError:
-            return None
+        # Key line: plain dict lookup; unknown labels return None without raising/catching ValueError.
+        return _INTENT_BY_VALUE.get(value) if isinstance(value, str) else None
 
     def _parse_confidence(self, value: Any) -> float:
         try:
@@ -236,29 +286,29 @@ class IntentClassifier:
         )
 
     def _looks_like_generic_help(self, text: str) -> bool:
-        t = (text or "").strip().lower()
-        return t in {
-            "help",
-            "help me",
-            "i need help",
-            "need help",
-            "not sure",
-            "not sure what to ask",
-            "what can you do",
-            "what do you do",
-            "how can you help",
-            "can you help",
-            "please help",
-            "pls help",
-        }
+        t = (text or "").strip()
+        # Key line: longer messages can't be one of the phrases, so they skip the lowercase copy.
+        return len(t) <= _GENERIC_HELP_MAX_LEN and t.lower() in _GENERIC_HELP_PHRASES
 
     def _looks_like_amount_only(self, text: str) -> bool:
-        t = (text or "").strip()
-        return bool(re.fullmatch(r"\d{1,3}(?:,\d{3})*(?:\.\d+)?|\d+(?:\.\d+)?", t))
+        # Role: "100", "1,200", "12.50" (plain or 3-digit comma groups, optional decimals) without the regex engine.
+        # Key line: str.isdecimal() is exactly the regex's \d (Unicode Nd), so the accepted set is unchanged.
+        whole, dot, frac = (text or "").strip().partition(".")
+        if dot and not frac.isdecimal():
+            return False
+        if whole.isdecimal():
+            return True
+        head, *groups = whole.split(",")
+        return (
+            1 <= len(head) <= 3
+            and head.isdecimal()
+            and bool(groups)
+            and all(len(g) == 3 and g.isdecimal() for g in groups)
+        )
 
     def _looks_like_currency_pair(self, text: str) -> bool:
         t = (text or "").strip().upper()
-        return bool(re.search(r"\b[A-Z]{3}\s*(?:TO|->|-|/)\s*[A-Z]{3}\b", t))
+        return bool(_CURRENCY_PAIR_RE.search(t))
 
     def _looks_like_itinerary_continue(self, text: str) -> bool:
         t = (text or "").lower().strip()
@@ -6,17 +6,47 @@ from __future__ import annotations
 from typing import Any, Dict, List, Optional
 
 import backend.config as config
-from backend.llm.gemini_client import GeminiClient
+from backend.core.trust_layer import TOOL_CODE_FENCE_RE
+from backend.llm.gemini_client import GeminiClient, get_gemini_client
 from backend.models.intent import Intent
 from backend.models.state import State
 from backend.prompts.response_prompt import build_response_prompt
 from backend.prompts.system_prompt import build_system_prompt
 from backend.utils.weather_rules import mentions_month, is_seasonal_weather_question
 
+# Key lines: preamble prefixes for _clean_llm_output; str.startswith takes the whole tuple in one C-level call.
+_ALWAYS_DROP_PREFIXES = (
+    "the user",
+    "my plan",
+    "i will",
+    "i'll",
+    "i am going to",
+    "here's my plan",
+    "i have weather data",
+)
+
+_SOFT_DROP_PREFIXES = ("okay", "ok", "sure", "alright", "got it")
+
+_WEATHER_PREFIXES = (
+    "here's the weather",
+    "here is the weather",
+    "here are the weather",
+    "here's the forecast",
+    "here is the forecast",
+)
+
+
+def _as_float(value: Any) -> Any:
+    # Role: best-effort float(); values that can't convert are passed through unchanged.
+    try:
+        return float(value)
+    except Exception:
+        return value
+
 
 class ResponseGenerator:
     def __init__(self, client: Optional[GeminiClient] = None) -> None:
-        self.client = client or GeminiClient()
+        self.client = client or get_gemini_client()
 
     def _clean_llm_output(self, text: str) -> str:
         # Role: remove common filler/preambles without changing actual content.
@@ -25,51 +55,26 @@ class ResponseGenerator:
 
         lines = [ln.rstrip() for ln in text.strip().splitlines()]
 
-        always_drop_prefixes = (
-            "the user",
-            "my plan",
-            "i will",
-            "i'll",
-            "i am going to",
-            "here's my plan",
-            "i have weather data",
-        )
-
-        soft_drop_prefixes = ("okay", "ok", "sure", "alright", "got it")
+        for i, ln in enumerate(lines):
+            low_norm = ln.strip().lower().rstrip(":,.-! ")
 
-        weather_prefixes = (
-            "here's the weather",
-            "here is the weather",
-            "here are the weather",
-            "here's the forecast",
-            "here is the forecast",
-        )
+            if not low_norm:
+                continue
 
-        cleaned: list[str] = []
-        skipping = True
+            if low_norm.startswith(_ALWAYS_DROP_PREFIXES):
+                continue
 
-        for ln in lines:
-            low = ln.strip().lower()
-            low_norm = low.rstrip(":,.-! ")
+            if low_norm.startswith(_SOFT_DROP_PREFIXES) and len(low_norm) <= 40:
+                continue
 
-            if skipping:
-                if not low_norm:
-                    continue
+            if low_norm.startswith(_WEATHER_PREFIXES) and len(low_norm) <= 80:
+                continue
 
-                if any(low_norm.startswith(p) for p in always_drop_prefixes):
-                    continue
+            # Key line: first real content line; it and everything after it are kept as-is (no more per-line checks).
+            out = "\n".join(lines[i:]).strip()
+            return out if out else text.strip()
 
-                if any(low_norm.startswith(p) for p in soft_drop_prefixes) and len(low_norm) <= 40:
-                    continue
-
-                if any(low_norm.startswith(p) for p in weather_prefixes) and len(low_norm) <= 80:
-                    continue
-
-            skipping = False
-            cleaned.append(ln)
-
-        out = "\n".join(cleaned).strip()
-        return out if out else text.strip()
+        return text.strip()
 
     def _looks_like_tool_code(self, text: str) -> bool:
         # Role: detect tool-code leak (extra defense; TrustLayer also checks).
@@ -81,7 +86,7 @@ class ResponseGenerator:
     def _strip_tool_code_fences(self, text: str) -> str:
         if not text:
             return text
-        return text.replace("```tool_code", "").replace("```", "").strip()
+        return TOOL_CODE_FENCE_RE.sub("", text).strip()
 
     def _format_currency_from_tool(self, tool_data: Dict[str, Any]) -> str:
         # Role: deterministic user-facing format for currency conversions (tool_data is source of truth).
@@ -92,17 +97,11 @@ class ResponseGenerator:
         amount = tool_data.get("amount")
         converted = tool_data.get("converted_amount")
 
-        try:
-            amount_f = float(amount)
-        except Exception:
-            amount_f = amount
-
-        try:
-            converted_f = float(converted)
-        except Exception:
-            converted_f = converted
-
+        # Key line: completeness first, so incomplete data skips the numeric conversions entirely.
         if rate_date and base and to and rate is not None and amount is not None and converted is not None:
+            # CurrencyClient already returns floats; only other types go through float().
+            amount_f = amount if type(amount) is float else _as_float(amount)
+            converted_f = converted if type(converted) is float else _as_float(converted)
             return (
                 f"Based on data from {rate_date}, {amount_f:g} {base} converts to {converted_f:.2f} {to} "
                 f"at a rate of {rate}."
@@ -123,10 +122,13 @@ class ResponseGenerator:
         # 1) If currency + tool_data -> deterministic formatter (no LLM)
         # 2) Else -> build prompts -> call LLM
         # 3) Clean output (preambles, tool-code leaks)
+
+        debug = config.DEBUG
+
         if intent == Intent.CURRENCY_CONVERSION and tool_data is not None:
             out = self._format_currency_from_tool(tool_data)
 
-            if config.DEBUG:
+            if debug:
                 print("\n--- RESPONSE GENERATOR (DETERMINISTIC) ---")
                 print("INTENT:", intent)
                 print("TOOL DATA:", tool_data)
@@ -157,20 +159,19 @@ class ResponseGenerator:
             force_seasonal=force_seasonal,
         )
 
-        if config.DEBUG:
+        if debug:
             print("\n--- RESPONSE GENERATOR ---")
             print("INTENT:", intent)
-            print("TRIP CONTEXT:", state.trip_profile.model_dump())
+            print("TRIP CONTEXT:", state.trip_profile.cached_dump())
             if tool_data is not None:
                 print("TOOL DATA:", tool_data)
             if recent_messages:
                 print("RECENT:", recent_messages)
             print("-------------------------")
 
-        full_prompt = f"{system_prompt}\n\n{user_prompt}"
-        response = self.client.generate_text(full_prompt)
+        response = self.client.generate_text(user_prompt, system=system_prompt)
 
-        if config.DEBUG:
+        if debug:
             raw_preview = (response or "").strip()
             print(
                 "RAW RESPONSE (preview):\n",
@@ -183,7 +184,7 @@ class ResponseGenerator:
         if self._looks_like_tool_code(response):
             response = self._strip_tool_code_fences(response)
 
-        if config.DEBUG:
+        if debug:
             print("CLEANED RESPONSE:\n", response)
             print("-------------------------\n")
 
@@ -1,14 +1,13 @@
 # Role: Small typed contract for routing. Decision is the output of DecisionLogic and drives the FlowController:
-# (ask clarification / call tool / generate response / out-of-scope). Validator enforces "tool_name only for tools".
+# (ask clarification / call tool / generate response / out-of-scope). __post_init__ enforces "tool_name only for tools".
 
 from __future__ import annotations
 
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Optional
+from typing import Optional, Sequence
 from typing import Any, Dict
 
-from pydantic import BaseModel, Field, model_validator
-
 
 class Action(str, Enum):
     ASK_CLARIFICATION = "ask_clarification"
@@ -17,25 +16,25 @@ class Action(str, Enum):
     OUT_OF_SCOPE_RESPONSE = "out_of_scope_response"
 
 
-class Decision(BaseModel):
+# Key line: built on every turn, so a slotted frozen dataclass (no Pydantic model construction/validation pass).
+@dataclass(frozen=True, slots=True)
+class Decision:
     action: Action
-    missing_info: List[str] = Field(default_factory=list)
+    # Key line: a tuple on shared module-level decisions, so callers copy rather than mutate it.
+    missing_info: Sequence[str] = field(default_factory=list)
     tool_name: Optional[str] = None
     notes: Optional[str] = None
     tool_payload: Optional[Dict[str, Any]] = None
 
-    @model_validator(mode="after")
-    def _check_tool_name(self):
-        # CALL_TOOL requires tool_name
-        if self.action == Action.CALL_TOOL and not self.tool_name:
-            raise ValueError("tool_name is required when action=CALL_TOOL")
+    def __post_init__(self) -> None:
+        # Key line: one identity check picks the branch; valid decisions pass with at most two comparisons.
+        if self.action is Action.CALL_TOOL:
+            # CALL_TOOL requires tool_name
+            if not self.tool_name:
+                raise ValueError("tool_name is required when action=CALL_TOOL")
+            return
 
         # Non-tool actions must not carry tool_name/tool_payload
-        if self.action != Action.CALL_TOOL:
-            if self.tool_name is not None:
-                raise ValueError("tool_name must be None unless action=CALL_TOOL")
-            if self.tool_payload is not None:
-                raise ValueError("tool_payload must be None unless action=CALL_TOOL")
-
-        return self
-
+        if self.tool_name is not None or self.tool_payload is not None:
+            field_name = "tool_name" if self.tool_name is not None else "tool_payload"
+            raise ValueError(f"{field_name} must be None unless action=CALL_TOOL")
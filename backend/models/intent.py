@@ -13,3 +13,16 @@ class Intent(str, Enum):
     CONSTRAINTS_UPDATE = "constraints_update"
     CLARIFICATION_NEEDED = "clarification_needed"
     OUT_OF_SCOPE = "out_of_scope"
+
+
+# Key line: "goal" intents are the main user goals that follow-ups (constraints_update) attach to.
+# Shared by FlowController, FallbackHandler and DecisionLogic; frozenset so it is built and hashed once.
+GOAL_INTENTS = frozenset(
+    {
+        Intent.ITINERARY_PLANNING,
+        Intent.ATTRACTIONS_RECOMMENDATIONS,
+        Intent.PACKING_LIST,
+        Intent.WEATHER_QUERY,
+        Intent.CURRENCY_CONVERSION,
+    }
+)
@@ -1,17 +1,25 @@
 # Role: Single chat message schema for conversation_history. Stored in State and passed into prompts
-# (role + content + timestamp). Pydantic makes it easy to serialize/debug.
+# (role + content + timestamp). A plain dataclass, so State still serializes/debugs it through Pydantic.
 
 from __future__ import annotations
 
+import time
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Literal
 
-from pydantic import BaseModel, Field
-
 Role = Literal["user", "assistant", "system"]
 
 
-class Message(BaseModel):
+# Key line: one per appended message, so a slotted frozen dataclass (no Pydantic model construction/validation pass).
+@dataclass(frozen=True, slots=True)
+class Message:
     role: Role
     content: str
-    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    # Key line: epoch seconds (time.time) instead of an aware datetime; cheaper to create per appended message.
+    timestamp: float = field(default_factory=time.time)
+
+    @property
+    def timestamp_dt(self) -> datetime:
+        # Role: UTC datetime view of the timestamp for display/debugging.
+        return datetime.fromtimestamp(self.timestamp, tz=timezone.utc)
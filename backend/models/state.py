@@ -1,20 +1,25 @@
 # Role: Per-session state container. Holds the evolving TripProfile and conversation history,
 # plus small "flow memory" fields like last_intent and pending_missing_info.
 
-from datetime import datetime, timezone
-from typing import List, Optional
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 from backend.models.intent import Intent
 from backend.models.message import Message
 from backend.models.trip_profile import TripProfile
 
+# Fields exposed by the /state snapshot; assigning any of them invalidates the cached view.
+_SNAPSHOT_FIELDS = frozenset({"trip_profile", "pending_missing_info", "last_intent", "turn_count"})
+
 
 class State(BaseModel):
     session_id: str
     trip_profile: TripProfile = Field(default_factory=TripProfile)
-    conversation_history: List[Message] = Field(default_factory=list)
+    # Key line: a deque, so StateManager can bound it with maxlen (oldest messages drop on append).
+    conversation_history: Deque[Message] = Field(default_factory=deque)
 
     # Key line: last_intent is how we keep a "current goal" for constraints updates (follow-ups).
     last_intent: Optional[Intent] = None
@@ -27,6 +32,36 @@ class State(BaseModel):
     # Key line: single-slot clarification loop ("what are we waiting for?").
     pending_missing_info: List[str] = Field(default_factory=list)
 
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    # Key line: epoch seconds (time.time), same clock as Message.timestamp.
+    created_at: float = Field(default_factory=time.time)
+    updated_at: float = Field(default_factory=time.time)
+
+    _snapshot_cache: Optional[Dict[str, Any]] = PrivateAttr(default=None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in _SNAPSHOT_FIELDS:
+            self._snapshot_cache = None
+
+    @property
+    def pending_slot(self) -> Optional[str]:
+        # Key line: the clarification loop holds at most one slot; expose it as a plain str for cheap compares.
+        pending = self.pending_missing_info
+        return pending[0] if pending else None
 
+    def snapshot(self) -> Dict[str, Any]:
+        # Role: JSON-safe read view for /state. Rebuilt only after a snapshot field is reassigned
+        # or the trip profile's own cached dump changed (profile edits don't go through State.__setattr__).
+        profile = self.trip_profile.cached_dump()
+        cache = self._snapshot_cache
+        if cache is None or cache["trip_profile"] is not profile:
+            cache = {
+                "session_id": self.session_id,
+                "trip_profile": profile,
+                "pending_missing_info": self.pending_missing_info,
+                # Intent is a str enum, so it encodes as its value without a .value lookup.
+                "last_intent": self.last_intent,
+                "turn_count": self.turn_count,
+            }
+            self._snapshot_cache = cache
+        return cache
@@ -3,10 +3,18 @@
 
 from __future__ import annotations
 
+import json
+import sys
 from datetime import date
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
+
+# Key line: the schema's categorical budget/pace values; matching updates store these shared objects
+# (one copy across all sessions) instead of a fresh string per profile.
+_CATEGORICAL_VALUES = {
+    sys.intern(value): sys.intern(value) for value in ("low", "mid", "high", "relaxed", "balanced", "intense")
+}
 
 
 class TripProfile(BaseModel):
@@ -23,6 +31,32 @@ class TripProfile(BaseModel):
     pace: Optional[str] = None
     constraints: List[str] = Field(default_factory=list)
 
+    # Key line: memoized JSON-safe dump (/state, cache keys, debug logs). Cleared on any field write,
+    # including the month-roll guardrail's start_date/end_date assignments.
+    _dump_cache: Optional[Dict[str, Any]] = PrivateAttr(default=None)
+    # Key line: (dump it was built from, JSON text); stale as soon as cached_dump() returns a new dict.
+    _json_cache: Optional[Tuple[Dict[str, Any], str]] = PrivateAttr(default=None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if not name.startswith("_"):
+            self._dump_cache = None
+
+    def cached_dump(self) -> Dict[str, Any]:
+        # Role: JSON-safe dict of the profile, rebuilt only after a change. Treat as read-only.
+        if self._dump_cache is None:
+            self._dump_cache = self.model_dump(mode="json")
+        return self._dump_cache
+
+    def cached_json(self) -> str:
+        # Role: json.dumps of cached_dump() (field order, non-ASCII kept) for the response prompt's trip context.
+        dump = self.cached_dump()
+        cache = self._json_cache
+        if cache is None or cache[0] is not dump:
+            cache = (dump, json.dumps(dump, ensure_ascii=False))
+            self._json_cache = cache
+        return cache[1]
+
     def apply_updates(self, updates: Dict[str, Any]) -> None:
         # 1) Ignore empty updates
         # 2) Normalize/validate types (strip strings, parse ISO dates)
@@ -30,6 +64,9 @@ class TripProfile(BaseModel):
         if not updates:
             return
 
+        # Key line: list fields below are mutated in place (no __setattr__), so drop the cached dump here.
+        self._dump_cache = None
+
         destination = updates.get("destination")
         if isinstance(destination, str) and destination.strip():
             self.destination = destination.strip()
@@ -38,15 +75,20 @@ class TripProfile(BaseModel):
         if start_date is not None:
             if isinstance(start_date, date):
                 self.start_date = start_date
-            elif isinstance(start_date, str) and start_date.strip():
-                self.start_date = date.fromisoformat(start_date.strip())
+            elif isinstance(start_date, str):
+                # Key line: strip once; date.fromisoformat is C-implemented, faster than slicing + int() per part.
+                cleaned = start_date.strip()
+                if cleaned:
+                    self.start_date = date.fromisoformat(cleaned)
 
         end_date = updates.get("end_date")
         if end_date is not None:
             if isinstance(end_date, date):
                 self.end_date = end_date
-            elif isinstance(end_date, str) and end_date.strip():
-                self.end_date = date.fromisoformat(end_date.strip())
+            elif isinstance(end_date, str):
+                cleaned = end_date.strip()
+                if cleaned:
+                    self.end_date = date.fromisoformat(cleaned)
 
         duration_days = updates.get("duration_days")
         if isinstance(duration_days, int):
@@ -55,20 +97,22 @@ class TripProfile(BaseModel):
         for field in ("budget", "travelers", "pace"):
             value = updates.get(field)
             if isinstance(value, str) and value.strip():
-                setattr(self, field, value.strip())
-
-        interests = updates.get("interests")
-        if isinstance(interests, list):
-            for interest in interests:
-                if isinstance(interest, str):
-                    cleaned = interest.strip()
-                    if cleaned and cleaned not in self.interests:
-                        self.interests.append(cleaned)
-
-        constraints = updates.get("constraints")
-        if isinstance(constraints, list):
-            for constraint in constraints:
-                if isinstance(constraint, str):
-                    cleaned = constraint.strip()
-                    if cleaned and cleaned not in self.constraints:
-                        self.constraints.append(cleaned)
+                cleaned = value.strip()
+                setattr(self, field, _CATEGORICAL_VALUES.get(cleaned, cleaned))
+
+        _merge_unique(self.interests, updates.get("interests"))
+        _merge_unique(self.constraints, updates.get("constraints"))
+
+
+def _merge_unique(target: List[str], values: Any) -> None:
+    # Role: append stripped, non-empty strings from `values` that `target` doesn't already contain (order kept).
+    # Key line: one set per call makes each membership check O(1) instead of a scan of the growing list.
+    if not isinstance(values, list):
+        return
+    seen = set(target)
+    for value in values:
+        if isinstance(value, str):
+            cleaned = value.strip()
+            if cleaned and cleaned not in seen:
+                seen.add(cleaned)
+                target.append(cleaned)
@@ -9,6 +9,28 @@ from typing import Dict, List, Optional
 from backend.models.intent import Intent
 from backend.models.state import State
 
+# Key line: static instructions are built once at import; only the per-call context is formatted.
+_FALLBACK_RULES = """
+FALLBACK RULES (MUST FOLLOW):
+- Output ONLY a user-facing message (no reasoning, no system talk, no JSON).
+- Be calm and helpful.
+- Ask at most ONE short clarification question.
+- Prefer the most important next piece of info:
+  1) If "pending_missing_info" exists: ask for that.
+  2) Else if last_intent is null: ask the user to choose goal: itinerary / attractions / packing / weather / currency conversion.
+  3) Else ask the next required info for that goal:
+     - itinerary needs destination + dates_or_duration
+     - attractions needs destination
+     - packing needs destination (and optionally month)
+     - weather needs destination (dates optional)
+     - currency conversion needs amount + currency pair (e.g., "100 USD to EUR")
+
+- If you already have enough info for the user’s goal, provide a short helpful answer (bullets), and optionally ask ONE follow-up question.
+- Do NOT repeat the exact same clarification question that was asked in the last assistant message.
+
+Keep it concise.
+""".strip()
+
 
 def build_fallback_prompt(
     *,
@@ -22,19 +44,12 @@ def build_fallback_prompt(
 
     # Step 1: build compact context (JSON-safe dates).
     context = {
-        "destination": trip.destination,
-        "start_date": str(trip.start_date) if trip.start_date is not None else None,
-        "end_date": str(trip.end_date) if trip.end_date is not None else None,
-        "duration_days": trip.duration_days,
-        "budget": trip.budget,
-        "travelers": trip.travelers,
-        "interests": trip.interests,
-        "pace": trip.pace,
-        "constraints": trip.constraints,
+        **trip.cached_dump(),
         "pending_missing_info": state.pending_missing_info,
         "last_intent": state.last_intent.value if state.last_intent else None,
         "turn_count": state.turn_count,
     }
+    context_json = json.dumps(context, ensure_ascii=False)
 
     history_block = ""
     last_assistant = ""
@@ -68,27 +83,10 @@ Current user message: {user_message}
 Current intent (best guess): {intent_str}
 
 Trip context (source of truth):
-{json.dumps(context, ensure_ascii=False)}
+{context_json}
 {err_block}
 {last_assistant_block}
 
-FALLBACK RULES (MUST FOLLOW):
-- Output ONLY a user-facing message (no reasoning, no system talk, no JSON).
-- Be calm and helpful.
-- Ask at most ONE short clarification question.
-- Prefer the most important next piece of info:
-  1) If "pending_missing_info" exists: ask for that.
-  2) Else if last_intent is null: ask the user to choose goal: itinerary / attractions / packing / weather / currency conversion.
-  3) Else ask the next required info for that goal:
-     - itinerary needs destination + dates_or_duration
-     - attractions needs destination
-     - packing needs destination (and optionally month)
-     - weather needs destination (dates optional)
-     - currency conversion needs amount + currency pair (e.g., "100 USD to EUR")
-
-- If you already have enough info for the user’s goal, provide a short helpful answer (bullets), and optionally ask ONE follow-up question.
-- Do NOT repeat the exact same clarification question that was asked in the last assistant message.
-
-Keep it concise.
+{_FALLBACK_RULES}
 {history_block}
 """.strip()
@@ -4,20 +4,110 @@
 from __future__ import annotations
 
 import json
-from datetime import date
-from typing import List, Optional
+import time
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import List, Optional, Tuple
 
 from backend.models.intent import Intent
 
 
+# Key lines: examples anchor the JSON format and teach follow-up answers as constraints_update.
+# Only the good example depends on today's date; the rest is serialized once at import.
+@lru_cache(maxsize=4)
+def _good_example_json(today: str) -> str:
+    good_example = {
+        "intent": "weather_query",
+        "confidence": 0.9,
+        "extracted_updates": {
+            "destination": "Rome",
+            "start_date": today,
+            "end_date": None,
+            "duration_days": None,
+            "budget": None,
+            "travelers": None,
+            "interests": [],
+            "pace": None,
+            "constraints": [],
+        },
+        "missing_info": [],
+        "notes": "User asked about weather today.",
+    }
+    return json.dumps(good_example, ensure_ascii=False)
+
+
+_BAD_EXAMPLE_DESCRIPTION = (
+    "BAD (INVALID) OUTPUT EXAMPLE (do NOT copy): "
+    "a JSON object wrapped in markdown/code fences (a 'json' fenced block)."
+)
+
+_FOLLOWUP_CITY_EXAMPLE = {
+    "intent": "constraints_update",
+    "confidence": 0.85,
+    "extracted_updates": {
+        "destination": "Paris",
+        "start_date": None,
+        "end_date": None,
+        "duration_days": None,
+        "budget": None,
+        "travelers": None,
+        "interests": [],
+        "pace": None,
+        "constraints": [],
+    },
+    "missing_info": [],
+    "notes": "Follow-up answer: destination provided.",
+}
+
+_FOLLOWUP_DURATION_EXAMPLE = {
+    "intent": "constraints_update",
+    "confidence": 0.85,
+    "extracted_updates": {
+        "destination": None,
+        "start_date": None,
+        "end_date": None,
+        "duration_days": 5,
+        "budget": None,
+        "travelers": None,
+        "interests": [],
+        "pace": None,
+        "constraints": [],
+    },
+    "missing_info": [],
+    "notes": "Follow-up answer: duration provided.",
+}
+
+_INTENTS_JSON = json.dumps([i.value for i in Intent], ensure_ascii=False)
+_FOLLOWUP_CITY_JSON = json.dumps(_FOLLOWUP_CITY_EXAMPLE, ensure_ascii=False)
+_FOLLOWUP_DURATION_JSON = json.dumps(_FOLLOWUP_DURATION_EXAMPLE, ensure_ascii=False)
+
+# Key line: (day start, next midnight, ISO date) as epoch seconds; the date string only changes at midnight.
+_today_cache: Tuple[float, float, str] = (0.0, 0.0, "")
+
+
+def _today_iso() -> str:
+    # 1) Reuse the cached ISO date while the wall clock is still inside that local day
+    # 2) Otherwise rebuild it and the day's bounds (a clock jump backwards also lands here)
+    global _today_cache
+    now = time.time()
+    day_start, day_end, today = _today_cache
+    if day_start <= now < day_end:
+        return today
+    current = date.today()
+    day_start = datetime.combine(current, datetime.min.time()).timestamp()
+    day_end = datetime.combine(current + timedelta(days=1), datetime.min.time()).timestamp()
+    today = current.isoformat()
+    _today_cache = (day_start, day_end, today)
+    return today
+
+
 def build_intent_prompt(
     user_message: str,
     recent_messages: Optional[List[dict]] = None,
     pending_missing_info: Optional[List[str]] = None,
 ) -> str:
-    # Step 1: gather allowed intents and "today" for date normalization rules.
-    intents = [i.value for i in Intent]
-    today = date.today().isoformat()
+    # Step 1: gather "today" for date normalization rules (allowed intents are pre-serialized above).
+    today = _today_iso()
 
     history_block = ""
     if recent_messages:
@@ -77,66 +167,6 @@ def build_intent_prompt(
                     "- If the user's message is clearly a NEW travel question (not an answer), classify normally.\n"
                 )
 
-    # Key lines: examples anchor the JSON format and teach follow-up answers as constraints_update.
-    good_example = {
-        "intent": "weather_query",
-        "confidence": 0.9,
-        "extracted_updates": {
-            "destination": "Rome",
-            "start_date": today,
-            "end_date": None,
-            "duration_days": None,
-            "budget": None,
-            "travelers": None,
-            "interests": [],
-            "pace": None,
-            "constraints": [],
-        },
-        "missing_info": [],
-        "notes": "User asked about weather today.",
-    }
-
-    bad_example_description = (
-        "BAD (INVALID) OUTPUT EXAMPLE (do NOT copy): "
-        "a JSON object wrapped in markdown/code fences (a 'json' fenced block)."
-    )
-
-    followup_city_example = {
-        "intent": "constraints_update",
-        "confidence": 0.85,
-        "extracted_updates": {
-            "destination": "Paris",
-            "start_date": None,
-            "end_date": None,
-            "duration_days": None,
-            "budget": None,
-            "travelers": None,
-            "interests": [],
-            "pace": None,
-            "constraints": [],
-        },
-        "missing_info": [],
-        "notes": "Follow-up answer: destination provided.",
-    }
-
-    followup_duration_example = {
-        "intent": "constraints_update",
-        "confidence": 0.85,
-        "extracted_updates": {
-            "destination": None,
-            "start_date": None,
-            "end_date": None,
-            "duration_days": 5,
-            "budget": None,
-            "travelers": None,
-            "interests": [],
-            "pace": None,
-            "constraints": [],
-        },
-        "missing_info": [],
-        "notes": "Follow-up answer: duration provided.",
-    }
-
     return f"""
 ROLE:
 You are a STRICT intent-classification component for a Travel Assistant system.
@@ -151,13 +181,13 @@ HARD OUTPUT CONTRACT (NON-NEGOTIABLE):
 - Output MUST contain NO markdown and NO code fences.
 - Do NOT wrap the JSON in any kind of fenced block. Do NOT add headings or extra text.
 
-{bad_example_description}
+{_BAD_EXAMPLE_DESCRIPTION}
 
 VALID OUTPUT EXAMPLE (copy this style):
-{json.dumps(good_example, ensure_ascii=False)}
+{_good_example_json(today)}
 
 Allowed intents (choose exactly ONE):
-{json.dumps(intents, ensure_ascii=False)}
+{_INTENTS_JSON}
 
 Rules:
 1) Weather/best time/temps/rain/wind -> intent="weather_query"
@@ -222,10 +252,10 @@ Output JSON schema (fill all keys; use null/[] where unknown):
 
 Follow-up examples:
 User message: Paris
-{json.dumps(followup_city_example, ensure_ascii=False)}
+{_FOLLOWUP_CITY_JSON}
 
 User message: 5 days
-{json.dumps(followup_duration_example, ensure_ascii=False)}
+{_FOLLOWUP_DURATION_JSON}
 
 Now classify:
 {history_block}
@@ -9,70 +9,9 @@ from typing import Any, Dict, List, Optional
 from backend.models.intent import Intent
 from backend.models.state import State
 
-
-def build_response_prompt(
-    intent: Intent,
-    state: State,
-    recent_messages: Optional[List[Dict[str, str]]] = None,
-    tool_data: Optional[Dict[str, Any]] = None,
-    force_seasonal: bool = False,
-) -> str:
-
-    trip = state.trip_profile
-
-    # Step 1: create JSON-safe context (dates -> strings).
-    context: Dict[str, Any] = {
-        "destination": trip.destination,
-        "start_date": str(trip.start_date) if trip.start_date is not None else None,
-        "end_date": str(trip.end_date) if trip.end_date is not None else None,
-        "duration_days": trip.duration_days,
-        "budget": trip.budget,
-        "travelers": trip.travelers,
-        "interests": trip.interests,
-        "pace": trip.pace,
-        "constraints": trip.constraints,
-    }
-
-    history_block = ""
-    if recent_messages:
-        formatted = "\n".join([f'{m["role"]}: {m["content"]}' for m in recent_messages])
-        history_block = f"\n\nRecent conversation:\n{formatted}"
-
-    # Step 2: include tool data as "source of truth" when present.
-    tool_block = ""
-    if tool_data is not None:
-        label = "TOOL_DATA"
-        if intent == Intent.WEATHER_QUERY:
-            label = "WEATHER_TOOL_DATA (SOURCE OF TRUTH)"
-        elif intent == Intent.CURRENCY_CONVERSION:
-            label = "CURRENCY_TOOL_DATA (SOURCE OF TRUTH)"
-
-        tool_block = f"\n\n{label}:\n" + json.dumps(tool_data, ensure_ascii=False)
-
-    # Key idea: when weather tool is missing but dates exist, hint the model about horizon limits.
-    weather_hint = ""
-    if intent == Intent.WEATHER_QUERY and tool_data is None:
-        # Case 1: user asked about a specific date/range but tool missing (out of horizon / failed)
-        if context["start_date"] or context["end_date"]:
-            weather_hint = (
-                "\n\nHINT (WEATHER): The user asked about a specific date/range, but WEATHER_TOOL_DATA is missing. "
-                "This usually means the requested date is beyond the forecast horizon (~16 days) OR the tool failed. "
-                "In your answer: briefly mention the ~16-day forecast limit, then provide seasonal expectations "
-                "(typical ranges) and practical packing advice. Do NOT invent daily forecast numbers."
-            )
-
-        # Case 2: seasonal phrasing like "usually / typical / around this time of year"
-        elif force_seasonal:
-            weather_hint = (
-                "\n\nHINT (WEATHER): This is a SEASONAL question (e.g., 'usually', 'typical', 'around this time of year'). "
-                "Do NOT ask for dates. Treat it as 'this time of year' and answer with general seasonal expectations "
-                "(typical ranges + rain/wind pattern) and practical packing advice. Do NOT give exact daily highs/lows."
-            )
-
-    # Key idea: enforce a stable seasonal answer format when force_seasonal=True and tool_data is missing.
-    seasonal_weather_template = ""
-    if intent == Intent.WEATHER_QUERY and tool_data is None and force_seasonal:
-        seasonal_weather_template = """
+# Key lines: the seasonal template, per-intent policy blocks and the output scaffold are static, so they are built once at import.
+# The system instruction carries the persona/rules; only the trip context, tool data and history vary per turn.
+_SEASONAL_WEATHER_TEMPLATE = """
 SEASONAL WEATHER OUTPUT TEMPLATE (MUST FOLLOW):
 - Do NOT ask for dates.
 - Do NOT ask "Would you like that?" — just answer.
@@ -87,7 +26,7 @@ SEASONAL WEATHER OUTPUT TEMPLATE (MUST FOLLOW):
 5) One practical tip (e.g., plan indoor museum time if it rains).
 """.strip()
 
-    weather_policy = """
+_WEATHER_POLICY = """
 WEATHER RESPONSE POLICY (MUST FOLLOW):
 - If WEATHER_TOOL_DATA is provided:
   - Use ONLY that tool data for ALL numeric values (temp, precip, wind).
@@ -109,7 +48,7 @@ WEATHER RESPONSE POLICY (MUST FOLLOW):
   - If the user phrased it as "usually/typical/around this time of year", do NOT ask for dates — answer seasonally.
 """.strip()
 
-    attractions_policy = """
+_ATTRACTIONS_POLICY = """
 ATTRACTIONS RESPONSE POLICY (MUST FOLLOW):
 - If destination is present:
   - ALWAYS provide a starter set of attractions FIRST (at least 8–12 items).
@@ -120,7 +59,7 @@ ATTRACTIONS RESPONSE POLICY (MUST FOLLOW):
   - Ask ONE clarification question: "Which city/country are you visiting?"
 """.strip()
 
-    packing_policy = """
+_PACKING_POLICY = """
 PACKING RESPONSE POLICY (MUST FOLLOW):
 - If destination is present:
   - ALWAYS provide a starter packing list FIRST (do not block on missing dates/season).
@@ -130,7 +69,7 @@ PACKING RESPONSE POLICY (MUST FOLLOW):
   - Ask ONE clarification question: "Which city/country are you visiting?"
 """.strip()
 
-    currency_policy = """
+_CURRENCY_POLICY = """
 CURRENCY RESPONSE POLICY (MUST FOLLOW):
 - If CURRENCY_TOOL_DATA is provided:
   - Use ONLY that tool data for numeric values (rate, converted_amount).
@@ -140,7 +79,7 @@ CURRENCY RESPONSE POLICY (MUST FOLLOW):
   - Ask ONE clarification OR explain that rates could not be fetched.
 """.strip()
 
-    internal_scaffold = """
+_INTERNAL_SCAFFOLD = """
 INTERNAL STEPS (DO NOT OUTPUT):
 1) Identify the user’s goal from intent and the latest message.
 2) Check trip context + any tool data; list what’s missing mentally.
@@ -149,22 +88,88 @@ INTERNAL STEPS (DO NOT OUTPUT):
 5) Self-check: comply with policies + output rules; output ONLY the final answer.
 """.strip()
 
+# Key line: the four policy lines of the prompt per intent (only the matching one is non-empty), joined once here
+# instead of four conditional expressions per call.
+_POLICY_LINES_BY_INTENT = {
+    intent: "\n".join(
+        (
+            _WEATHER_POLICY if intent == Intent.WEATHER_QUERY else "",
+            _ATTRACTIONS_POLICY if intent == Intent.ATTRACTIONS_RECOMMENDATIONS else "",
+            _PACKING_POLICY if intent == Intent.PACKING_LIST else "",
+            _CURRENCY_POLICY if intent == Intent.CURRENCY_CONVERSION else "",
+        )
+    )
+    for intent in Intent
+}
+
+
+def build_response_prompt(
+    intent: Intent,
+    state: State,
+    recent_messages: Optional[List[Dict[str, str]]] = None,
+    tool_data: Optional[Dict[str, Any]] = None,
+    force_seasonal: bool = False,
+) -> str:
+
+    trip = state.trip_profile
+
+    # Step 1: JSON-safe trip context (dates -> strings); serialized once per profile change, not per prompt.
+    context_json = trip.cached_json()
+
+    history_block = ""
+    if recent_messages:
+        formatted = "\n".join([f'{m["role"]}: {m["content"]}' for m in recent_messages])
+        history_block = f"\n\nRecent conversation:\n{formatted}"
+
+    # Step 2: include tool data as "source of truth" when present.
+    tool_block = ""
+    if tool_data is not None:
+        label = "TOOL_DATA"
+        if intent == Intent.WEATHER_QUERY:
+            label = "WEATHER_TOOL_DATA (SOURCE OF TRUTH)"
+        elif intent == Intent.CURRENCY_CONVERSION:
+            label = "CURRENCY_TOOL_DATA (SOURCE OF TRUTH)"
+
+        tool_block = f"\n\n{label}:\n" + json.dumps(tool_data, ensure_ascii=False)
+
+    # Key idea: when weather tool is missing but dates exist, hint the model about horizon limits.
+    weather_hint = ""
+    if intent == Intent.WEATHER_QUERY and tool_data is None:
+        # Case 1: user asked about a specific date/range but tool missing (out of horizon / failed)
+        if trip.start_date is not None or trip.end_date is not None:
+            weather_hint = (
+                "\n\nHINT (WEATHER): The user asked about a specific date/range, but WEATHER_TOOL_DATA is missing. "
+                "This usually means the requested date is beyond the forecast horizon (~16 days) OR the tool failed. "
+                "In your answer: briefly mention the ~16-day forecast limit, then provide seasonal expectations "
+                "(typical ranges) and practical packing advice. Do NOT invent daily forecast numbers."
+            )
+
+        # Case 2: seasonal phrasing like "usually / typical / around this time of year"
+        elif force_seasonal:
+            weather_hint = (
+                "\n\nHINT (WEATHER): This is a SEASONAL question (e.g., 'usually', 'typical', 'around this time of year'). "
+                "Do NOT ask for dates. Treat it as 'this time of year' and answer with general seasonal expectations "
+                "(typical ranges + rain/wind pattern) and practical packing advice. Do NOT give exact daily highs/lows."
+            )
+
+    # Key idea: enforce a stable seasonal answer format when force_seasonal=True and tool_data is missing.
+    seasonal_weather_template = ""
+    if intent == Intent.WEATHER_QUERY and tool_data is None and force_seasonal:
+        seasonal_weather_template = _SEASONAL_WEATHER_TEMPLATE
+
     return f"""
 User intent: {intent.value}
 
 Trip context (source of truth):
-{json.dumps(context, ensure_ascii=False)}
-{weather_hint if intent == Intent.WEATHER_QUERY else ""}
-{seasonal_weather_template if intent == Intent.WEATHER_QUERY else ""}
+{context_json}
+{weather_hint}
+{seasonal_weather_template}
 
-{weather_policy if intent == Intent.WEATHER_QUERY else ""}
-{attractions_policy if intent == Intent.ATTRACTIONS_RECOMMENDATIONS else ""}
-{packing_policy if intent == Intent.PACKING_LIST else ""}
-{currency_policy if intent == Intent.CURRENCY_CONVERSION else ""}
+{_POLICY_LINES_BY_INTENT[intent]}
 
 {tool_block}
 
-{internal_scaffold}
+{_INTERNAL_SCAFFOLD}
 
 STRICT OUTPUT RULES:
 - Output ONLY the final answer to the user.
@@ -3,8 +3,12 @@
 
 from __future__ import annotations
 
+from functools import cache
 
+
+@cache
 def build_system_prompt() -> str:
+    # Key line: static text, so build (and strip) it once per process.
     return """
 You are a helpful Travel Assistant.
 
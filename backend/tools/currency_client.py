@@ -4,11 +4,17 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 import requests
 
 import backend.config as config
+from backend.tools.http_session import get_http_session
+from backend.utils.ttl_cache import TTLCache
+
+# Key line: Frankfurter publishes rates once per working day, so a (base, symbol) rate is reused for an hour.
+# Stores (rate date, base, rate); the conversion itself is recomputed per amount.
+_RATE_CACHE: TTLCache[Tuple[Optional[str], str, float]] = TTLCache(max_entries=512, ttl_seconds=3600.0)
 
 
 @dataclass(frozen=True)
@@ -37,34 +43,46 @@ class CurrencyClient:
         to_ccy = to_ccy.upper().strip()
 
         try:
-            params = {"base": from_ccy, "symbols": to_ccy}
-            r = requests.get(f"{self.BASE_URL}/latest", params=params, timeout=self._TIMEOUT_SECONDS)
-            r.raise_for_status()
-            payload = r.json()
-
-            rates = payload.get("rates") or {}
-            rate = rates.get(to_ccy)
-            if rate is None:
-                return CurrencyToolResult(ok=False, data={}, error=f"No rate returned for {to_ccy}")
-
-            converted = float(amount) * float(rate)
+            cache_key = (from_ccy, to_ccy)
+            cached = _RATE_CACHE.get(cache_key)
+            if cached is not None:
+                rate_date, base, rate = cached
+                if config.DEBUG:
+                    print("CURRENCY TOOL: rate cache hit", cache_key)
+            else:
+                params = {"base": from_ccy, "symbols": to_ccy}
+                r = get_http_session().get(f"{self.BASE_URL}/latest", params=params, timeout=self._TIMEOUT_SECONDS)
+                r.raise_for_status()
+                payload = r.json()
+
+                rates = payload.get("rates") or {}
+                rate = rates.get(to_ccy)
+                if rate is None:
+                    return CurrencyToolResult(ok=False, data={}, error=f"No rate returned for {to_ccy}")
+
+                rate_date = payload.get("date")
+                base = payload.get("base") or from_ccy
+                rate = float(rate)
+                _RATE_CACHE.put(cache_key, (rate_date, base, rate))
+
+                if config.DEBUG:
+                    print("\n--- CURRENCY TOOL ---")
+                    print("REQUEST:", params)
+                    print("RESPONSE date/base/to/rate:", rate_date, base, to_ccy, rate)
+                    print("---------------------\n")
+
+            converted = float(amount) * rate
 
             data = {
                 "source": "frankfurter",
-                "date": payload.get("date"),
-                "base": payload.get("base") or from_ccy,
+                "date": rate_date,
+                "base": base,
                 "to": to_ccy,
-                "rate": float(rate),
+                "rate": rate,
                 "amount": float(amount),
                 "converted_amount": float(converted),
             }
 
-            if config.DEBUG:
-                print("\n--- CURRENCY TOOL ---")
-                print("REQUEST:", params)
-                print("RESPONSE date/base/to/rate:", data["date"], data["base"], data["to"], data["rate"])
-                print("---------------------\n")
-
             return CurrencyToolResult(ok=True, data=data)
 
         except requests.RequestException as e:
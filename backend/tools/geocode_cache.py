@@ -0,0 +1,60 @@
+# Role: Optional on-disk cache for Open-Meteo geocoding results, so repeat destinations skip the geocoding
+# round-trip even after a restart. Enabled only when GEOCODE_CACHE_DIR is set (or a directory is passed in);
+# otherwise get/put are no-ops. Entries older than the TTL are treated as misses.
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+class GeocodeDiskCache:
+    def __init__(self, cache_dir: Optional[str] = None, ttl_seconds: float = 7 * 86400.0) -> None:
+        root = cache_dir or os.getenv("GEOCODE_CACHE_DIR")
+        self._dir: Optional[Path] = Path(root) if root else None
+        self._ttl_seconds = ttl_seconds
+
+    @property
+    def enabled(self) -> bool:
+        return self._dir is not None
+
+    def _path(self, key: str) -> Path:
+        # Key line: hash the normalized name, so any destination text maps to a safe file name.
+        return self._dir / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        if self._dir is None:
+            return None
+        path = self._path(key)
+        try:
+            if time.time() - path.stat().st_mtime > self._ttl_seconds:
+                return None
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        # 1) Write to a temp file in the same directory
+        # 2) os.replace -> readers see either the old file or the complete new one, never a partial write
+        if self._dir is None:
+            return
+        # Key line: best-effort; a failed write must never break the weather tool.
+        try:
+            self._dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self._dir, suffix=".tmp")
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(value, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_path)
@@ -0,0 +1,26 @@
+# Role: Shared HTTP session for the tool clients (Frankfurter, Open-Meteo). Reusing one requests.Session keeps
+# TCP/TLS connections alive between calls instead of opening a new connection per request.
+
+from __future__ import annotations
+
+from functools import lru_cache
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+@lru_cache(maxsize=1)
+def get_http_session() -> requests.Session:
+    # Key line: one pooled session per process; idempotent GETs retry twice on transient gateway errors.
+    # raise_on_status=False hands the last response back, so callers' raise_for_status() still reports it.
+    retry = Retry(
+        total=2,
+        backoff_factor=0.2,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({"GET"}),
+        raise_on_status=False,
+    )
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry))
+    return session
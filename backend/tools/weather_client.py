@@ -10,6 +10,12 @@ from typing import Any, Dict, Optional
 import requests
 
 from backend.models.trip_profile import TripProfile
+from backend.tools.geocode_cache import GeocodeDiskCache
+from backend.tools.http_session import get_http_session
+from backend.utils.ttl_cache import TTLCache
+
+# Key line: city -> coordinates is effectively static, so geocoding hits are kept for a week (misses are not cached).
+_GEO_CACHE: TTLCache[Dict[str, Any]] = TTLCache(max_entries=2048, ttl_seconds=7 * 86400.0)
 
 
 @dataclass(frozen=True)
@@ -24,7 +30,11 @@ class WeatherClient:
     FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
     FORECAST_HORIZON_DAYS = 16
 
-    def get_weather(self, trip: TripProfile) -> WeatherToolResult:
+    def __init__(self, geocode_cache: Optional[GeocodeDiskCache] = None) -> None:
+        # Key line: optional durable layer behind the in-process geocode cache (GEOCODE_CACHE_DIR).
+        self.geocode_cache = geocode_cache or GeocodeDiskCache()
+
+    def get_weather(self, trip: TripProfile, today: Optional[date] = None) -> WeatherToolResult:
         # 1) Validate destination + date window
         # 2) Geocode destination -> (lat, lon)
         # 3) Fetch forecast for requested date range
@@ -36,7 +46,7 @@ class WeatherClient:
         dest = trip.destination.strip()
 
         # Treat "no dates" as "today" for tool calls
-        start = trip.start_date or date.today()
+        start = trip.start_date or today or date.today()
         end = trip.end_date or start
 
         days = (end - start).days + 1
@@ -70,7 +80,7 @@ class WeatherClient:
                 "end_date": end.isoformat(),
             }
 
-            r = requests.get(self.FORECAST_URL, params=params, timeout=15)
+            r = get_http_session().get(self.FORECAST_URL, params=params, timeout=15)
             r.raise_for_status()
             payload = r.json()
 
@@ -104,9 +114,22 @@ class WeatherClient:
 
     def _geocode(self, name: str) -> Optional[Dict[str, Any]]:
         # Role: resolve city name -> coordinates (single best result).
+        cache_key = name.strip().lower()
+        cached = _GEO_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+        cached = self.geocode_cache.get(cache_key)
+        if cached is not None:
+            _GEO_CACHE.put(cache_key, cached)
+            return cached
+
         params = {"name": name, "count": 1, "language": "en", "format": "json"}
-        r = requests.get(self.GEO_URL, params=params, timeout=15)
+        r = get_http_session().get(self.GEO_URL, params=params, timeout=15)
         r.raise_for_status()
         payload = r.json()
         results = payload.get("results") or []
-        return results[0] if results else None
+        if not results:
+            return None
+        _GEO_CACHE.put(cache_key, results[0])
+        self.geocode_cache.put(cache_key, results[0])
+        return results[0]
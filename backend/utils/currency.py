@@ -5,6 +5,7 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional, Tuple
 
 _AMOUNT = r"(\d{1,3}(?:,\d{3})*(?:\.\d+)?|\d+(?:\.\d+)?)"
@@ -19,6 +20,29 @@ _ALIASES = {
 
 _TOKEN = r"[A-Za-z$₪€]+"
 
+# Currency words/symbols that mark a "day N" message as money (single alternation, longest first).
+_CCY_KEYWORDS = ("$", "€", "₪", "usd", "eur", "ils", "gbp", "jpy", "dollar", "euro", "shekel", "pound", "yen")
+
+# Key lines: patterns are compiled once at import (no per-call f-string build or re cache lookup).
+_DAY_RE = re.compile(r"\bday\s+\d+\b")
+_CCY_KEYWORD_RE = re.compile("|".join(re.escape(k) for k in sorted(_CCY_KEYWORDS, key=len, reverse=True)))
+_AMOUNT_RE = re.compile(rf"\b{_AMOUNT}\b")
+_PAIR_TO_RE = re.compile(rf"({_TOKEN})\s*(?:to|in)\s*({_TOKEN})", re.IGNORECASE)
+_PAIR_SEP_RE = re.compile(rf"({_TOKEN})\s*[/\-]\s*({_TOKEN})", re.IGNORECASE)
+_QUERY_RE = re.compile(rf"\b{_AMOUNT}\b\s*({_TOKEN})\s*(?:to|in)\s*({_TOKEN})", re.IGNORECASE)
+_QUERY_REV_RE = re.compile(rf"({_TOKEN})\s*to\s*({_TOKEN})\s*\b{_AMOUNT}\b", re.IGNORECASE)
+_TOKEN_STRIP_RE = re.compile(r"[^a-z$₪€]")
+# Key line: every amount needs a digit, so digit-free messages (most non-currency turns) skip the parsers' regexes.
+_DIGIT_RE = re.compile(r"\d")
+
+# Key line: the whole-message form ("100 usd to eur") only accepts known currency words/codes,
+# so look-alikes such as "1 day in nyc" never match.
+_KNOWN_CCY = "|".join(re.escape(k) for k in sorted(_ALIASES, key=len, reverse=True))
+_EXACT_QUERY_RE = re.compile(
+    rf"^\s*(?:convert\s+)?{_AMOUNT}\s*({_KNOWN_CCY})\s*(?:to|in)\s*({_KNOWN_CCY})\s*[?.!]?\s*$",
+    re.IGNORECASE,
+)
+
 
 @dataclass(frozen=True)
 class CurrencyQuery:
@@ -33,7 +57,9 @@ def _normalize_currency_token(token: str) -> Optional[str]:
         return None
 
     t = token.strip().lower()
-    t = re.sub(r"[^a-z$₪€]", "", t)
+    # Key line: plain ASCII words ("usd", "dollars") have nothing to strip, so only other tokens hit the regex.
+    if not (t.isascii() and t.isalpha()):
+        t = _TOKEN_STRIP_RE.sub("", t)
     if not t:
         return None
 
@@ -54,23 +80,27 @@ def _parse_amount_str(raw: str) -> Optional[float]:
         return None
 
 
+# Key line: the parsers are pure (str -> immutable result); one turn may parse the same message several times
+# (DecisionLogic, history combine), so cache them.
+@lru_cache(maxsize=1024)
 def parse_currency_amount(text: str) -> Optional[float]:
     # Role: extract an amount-only message (e.g., "100", "1,200").
-    if not text:
+    if not text or not _DIGIT_RE.search(text):
         return None
 
     t = text.strip()
     low = t.lower()
 
-    if re.search(r"\bday\s+\d+\b", low) and not re.search(r"[$€₪]|usd|eur|ils|gbp|jpy|dollar|euro|shekel|pound|yen", low):
+    if _DAY_RE.search(low) and not _CCY_KEYWORD_RE.search(low):
         return None
 
-    m = re.search(rf"\b{_AMOUNT}\b", t)
+    m = _AMOUNT_RE.search(t)
     if not m:
         return None
     return _parse_amount_str(m.group(1))
 
 
+@lru_cache(maxsize=1024)
 def parse_currency_pair(text: str) -> Optional[Tuple[str, str]]:
     """
     Parses pair-only patterns:
@@ -84,7 +114,7 @@ def parse_currency_pair(text: str) -> Optional[Tuple[str, str]]:
         return None
     t = text.strip()
 
-    m = re.search(rf"({_TOKEN})\s*(?:to|in)\s*({_TOKEN})", t, flags=re.IGNORECASE)
+    m = _PAIR_TO_RE.search(t)
     if m:
         a = _normalize_currency_token(m.group(1))
         b = _normalize_currency_token(m.group(2))
@@ -92,7 +122,7 @@ def parse_currency_pair(text: str) -> Optional[Tuple[str, str]]:
             return a, b
 
     # Allow token pairs with separators, including symbols.
-    m = re.search(rf"({_TOKEN})\s*[/\-]\s*({_TOKEN})", t, flags=re.IGNORECASE)
+    m = _PAIR_SEP_RE.search(t)
     if m:
         a = _normalize_currency_token(m.group(1))
         b = _normalize_currency_token(m.group(2))
@@ -102,6 +132,7 @@ def parse_currency_pair(text: str) -> Optional[Tuple[str, str]]:
     return None
 
 
+@lru_cache(maxsize=1024)
 def parse_currency_query(text: str) -> Optional[CurrencyQuery]:
     """
     Parses full patterns like:
@@ -109,12 +140,12 @@ def parse_currency_query(text: str) -> Optional[CurrencyQuery]:
       - "1,200 $ to €"
       - "USD to EUR 100"
     """
-    if not text:
+    if not text or not _DIGIT_RE.search(text):
         return None
 
     t = text.strip()
 
-    m = re.search(rf"\b{_AMOUNT}\b\s*({_TOKEN})\s*(?:to|in)\s*({_TOKEN})", t, flags=re.IGNORECASE)
+    m = _QUERY_RE.search(t)
     if m:
         amount = _parse_amount_str(m.group(1))
         from_ccy = _normalize_currency_token(m.group(2))
@@ -122,7 +153,7 @@ def parse_currency_query(text: str) -> Optional[CurrencyQuery]:
         if amount is not None and from_ccy and to_ccy and from_ccy != to_ccy:
             return CurrencyQuery(amount=amount, from_ccy=from_ccy, to_ccy=to_ccy)
 
-    m = re.search(rf"({_TOKEN})\s*to\s*({_TOKEN})\s*\b{_AMOUNT}\b", t, flags=re.IGNORECASE)
+    m = _QUERY_REV_RE.search(t)
     if m:
         from_ccy = _normalize_currency_token(m.group(1))
         to_ccy = _normalize_currency_token(m.group(2))
@@ -131,3 +162,21 @@ def parse_currency_query(text: str) -> Optional[CurrencyQuery]:
             return CurrencyQuery(amount=amount, from_ccy=from_ccy, to_ccy=to_ccy)
 
     return None
+
+
+@lru_cache(maxsize=1024)
+def parse_exact_currency_query(text: str) -> Optional[CurrencyQuery]:
+    """
+    Parses messages that are nothing but a conversion request:
+      - "100 usd to eur"
+      - "convert 1,200 $ to €"
+      - "50 euros in shekels?"
+    """
+    if not text:
+        return None
+
+    # Key line: the anchored match only checks that nothing else is in the message; the values come from
+    # parse_currency_query, so callers get exactly what DecisionLogic will use for the tool call.
+    if not _EXACT_QUERY_RE.match(text):
+        return None
+    return parse_currency_query(text)
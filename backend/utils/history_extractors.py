@@ -3,7 +3,7 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from itertools import islice
 from typing import Optional, Sequence
 
 from backend.models.message import Message
@@ -15,28 +15,11 @@ from backend.utils.currency import (
 )
 
 
-@dataclass(frozen=True)
-class _CurrencyParts:
-    amount: Optional[float] = None
-    pair: Optional[tuple[str, str]] = None
-
-
-def _extract_currency_parts(text: str) -> _CurrencyParts:
-    # Step: prefer full parse; otherwise return partials.
-    full = parse_currency_query(text)
-    if full is not None:
-        return _CurrencyParts(amount=float(full.amount), pair=(full.from_ccy, full.to_ccy))
-
-    return _CurrencyParts(
-        amount=parse_currency_amount(text),
-        pair=parse_currency_pair(text),
-    )
-
-
 def combine_currency_query_from_history(
     *,
     user_message: str,
     conversation_history: Sequence[Message],
+    stop: Optional[int] = None,
     max_lookback_user_messages: int = 10,
     allow_amount_from_history: bool = False,
 ) -> Optional[CurrencyQuery]:
@@ -49,19 +32,27 @@ def combine_currency_query_from_history(
     if full_now is not None:
         return full_now
 
-    now_parts = _extract_currency_parts(user_message)
-    amount_now = now_parts.amount
-    pair_now = now_parts.pair
+    # The current message is not a full query, so its partials come straight from the partial parsers.
+    amount_now = parse_currency_amount(user_message)
+    pair_now = parse_currency_pair(user_message)
 
     if amount_now is None and pair_now is None:
         return None
 
+    # Key line: a missing amount can only come from history when allowed; otherwise no lookback can complete it.
+    need_amount = amount_now is None
+    need_pair = pair_now is None
+    if need_amount and not allow_amount_from_history:
+        return None
+
     found_amount: Optional[float] = None
     found_pair: Optional[tuple[str, str]] = None
 
     lookback_count = 0
 
-    for m in reversed(conversation_history):
+    # Key line: only messages before `stop` are considered; islice skips the tail without copying the history.
+    skip = 0 if stop is None else max(len(conversation_history) - stop, 0)
+    for m in islice(reversed(conversation_history), skip, None):
         if getattr(m, "role", None) != "user":
             continue
 
@@ -73,17 +64,13 @@ def combine_currency_query_from_history(
         if lookback_count > max_lookback_user_messages:
             break
 
-        prev_parts = _extract_currency_parts(text)
-
-        if found_pair is None and prev_parts.pair is not None:
-            found_pair = prev_parts.pair
-        
-        if allow_amount_from_history:
-            if found_amount is None and prev_parts.amount is not None:
-                found_amount = prev_parts.amount
+        # Key lines: parse only the part(s) still missing; a full query in history supplies both.
+        full = parse_currency_query(text)
+        if need_pair and found_pair is None:
+            found_pair = (full.from_ccy, full.to_ccy) if full is not None else parse_currency_pair(text)
+        if need_amount and found_amount is None:
+            found_amount = float(full.amount) if full is not None else parse_currency_amount(text)
 
-        need_amount = amount_now is None
-        need_pair = pair_now is None
         if (not need_amount or found_amount is not None) and (not need_pair or found_pair is not None):
             break
 
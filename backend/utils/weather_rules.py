@@ -5,6 +5,7 @@ from __future__ import annotations
 
 import re
 from datetime import date as dt_date
+from typing import Optional
 
 from backend.models.trip_profile import TripProfile
 
@@ -13,20 +14,36 @@ _MONTH_PATTERN = re.compile(
     r"jul(?:y)?|aug(?:ust)?|sep(?:tember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\b",
     re.IGNORECASE,
 )
+# Key line: the same month words as a set; ASCII text is checked by one tokenize + set intersection instead.
+_MONTH_WORDS = frozenset(
+    {
+        "jan", "january", "feb", "february", "mar", "march", "apr", "april", "may", "jun", "june",
+        "jul", "july", "aug", "august", "sep", "september", "oct", "october", "nov", "november",
+        "dec", "december",
+    }
+)
+_WORD_RE = re.compile(r"\w+")
+
+_SEASONAL_TRIGGERS = ("usually", "typical", "around this time of year", "on average", "generally")
+# Key line: one precompiled alternation instead of a Python-level scan per trigger.
+_SEASONAL_PATTERN = re.compile("|".join(re.escape(t) for t in _SEASONAL_TRIGGERS), re.IGNORECASE)
 
 
 def mentions_month(text: str) -> bool:
     # Role: fast check for month names (signals "seasonal" vs exact forecast).
-    return bool(_MONTH_PATTERN.search(text or ""))
+    text = text or ""
+    # Key line: IGNORECASE also folds "İ"/"ı"/"ſ" onto i/s, which str.lower() doesn't; non-ASCII text keeps the regex.
+    if not text.isascii():
+        return bool(_MONTH_PATTERN.search(text))
+    return not _MONTH_WORDS.isdisjoint(_WORD_RE.findall(text.lower()))
 
 
-def is_within_open_meteo_forecast_window(trip: TripProfile, horizon_days: int = 16) -> bool:
+def is_within_open_meteo_forecast_window(
+    trip: TripProfile, horizon_days: int = 16, today: Optional[dt_date] = None
+) -> bool:
     # 1) Normalize missing start/end
     # 2) Reject invalid/past ranges
-    # 3) Ensure both start/end are within horizon and range length is <= horizon
-
-    today = dt_date.today()
-
+    # 3) Ensure the range ends within horizon and its length is <= horizon
     start = trip.start_date
     end = trip.end_date
 
@@ -35,31 +52,14 @@ def is_within_open_meteo_forecast_window(trip: TripProfile, horizon_days: int =
 
     if start is None:
         start = end
-    if end is None:
+    elif end is None:
         end = start
 
-    if start is None or end is None:
-        return True
-
-    if end < start:
-        return False
-
-    if end < today:
-        return False
-
-    if (start - today).days > horizon_days:
-        return False
-
-    if (end - today).days > horizon_days:
-        return False
-
-    if (end - start).days + 1 > horizon_days:
-        return False
-
-    return True
+    # Key line: callers may pass the turn's `today` (one clock read per turn).
+    today = today or dt_date.today()
+    # Key line: with start <= end, "start within horizon" is implied by "end within horizon".
+    return start <= end and today <= end and (end - today).days <= horizon_days and (end - start).days < horizon_days
 
 def is_seasonal_weather_question(text: str) -> bool:
-    t = (text or "").lower()
-    triggers = ("usually", "typical", "around this time of year", "on average", "generally")
-    return any(x in t for x in triggers)
+    return bool(_SEASONAL_PATTERN.search(text or ""))
 
@@ -5,12 +5,18 @@
 from __future__ import annotations
 
 import uuid
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
 
 import requests
 import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 BACKEND_URL = "http://127.0.0.1:8000"
+_CONNECT_TIMEOUT = 0.5
+# Key line: _http() is shared by all browser sessions; each in-flight request holds one pooled socket.
+_BACKEND_POOL_SIZE = 16
 
 
 # ----------------------------
@@ -30,19 +36,36 @@ def ensure_session() -> None:
 # ----------------------------
 # Backend calls
 # ----------------------------
-def send_to_backend(session_id: str, user_message: str) -> str:
-    resp = requests.post(
+@st.cache_resource
+def _http() -> requests.Session:
+    # Key line: only GETs are retried; replaying a POST /chat would apply the turn twice.
+    retry = Retry(
+        total=2,
+        backoff_factor=0.1,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({"GET"}),
+        raise_on_status=False,
+    )
+    session = requests.Session()
+    session.mount(BACKEND_URL, HTTPAdapter(pool_connections=1, pool_maxsize=_BACKEND_POOL_SIZE, max_retries=retry))
+    return session
+
+
+def send_to_backend(session_id: str, user_message: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+    # Role: one turn -> (assistant text, post-turn snapshot or None if the backend didn't send it).
+    resp = _http().post(
         f"{BACKEND_URL}/chat",
         json={"session_id": session_id, "user_message": user_message},
-        timeout=30,
+        timeout=(_CONNECT_TIMEOUT, 30),
     )
     resp.raise_for_status()
-    return resp.json()["assistant_message"]
+    data = resp.json()
+    return data["assistant_message"], data.get("snapshot")
 
 
 def fetch_snapshot(session_id: str) -> Optional[Dict[str, Any]]:
     try:
-        r = requests.get(f"{BACKEND_URL}/state/{session_id}", timeout=10)
+        r = _http().get(f"{BACKEND_URL}/state/{session_id}", timeout=(_CONNECT_TIMEOUT, 10))
         if r.status_code != 200:
             return None
         return r.json()
@@ -53,9 +76,7 @@ def fetch_snapshot(session_id: str) -> Optional[Dict[str, Any]]:
 # ----------------------------
 # UI polish
 # ----------------------------
-def inject_css() -> None:
-    st.markdown(
-        """
+_CSS = """
 <style>
 /* Wide layout so chat input feels long */
 .block-container { max-width: 1200px; padding-top: 2rem; padding-bottom: 2rem; }
@@ -134,9 +155,13 @@ section[data-testid="stSidebar"] svg[data-testid*="icon"],
 /* Chat input height */
 div[data-testid="stChatInput"] textarea { min-height: 44px; }
 </style>
-""",
-        unsafe_allow_html=True,
-    )
+"""
+
+
+def inject_css() -> None:
+    # Key line: emitted every rerun; Streamlit drops elements a rerun doesn't re-create.
+    st.markdown(_CSS, unsafe_allow_html=True)
+
 
 # ----------------------------
 # Formatting helpers
@@ -144,6 +169,11 @@ div[data-testid="stChatInput"] textarea { min-height: 44px; }
 def _title_case_city(s: Optional[str]) -> Optional[str]:
     if not s or not isinstance(s, str):
         return None
+    return _title_case_city_str(s)
+
+
+@lru_cache(maxsize=256)
+def _title_case_city_str(s: str) -> Optional[str]:
     s = s.strip()
     if not s:
         return None
@@ -179,15 +209,10 @@ def _fmt_value(v: Any) -> str:
 
 
 def _row(icon: str, label: str, value: str) -> str:
-    return f"""
-<div class="ta-row">
-  <div class="ta-icon">{icon}</div>
-  <div class="ta-col">
-    <div class="ta-k">{label}</div>
-    <div class="ta-v">{value}</div>
-  </div>
-</div>
-"""
+    return (
+        f'<div class="ta-row"><div class="ta-icon">{icon}</div>'
+        f'<div class="ta-col"><div class="ta-k">{label}</div><div class="ta-v">{value}</div></div></div>'
+    )
 
 
 # ----------------------------
@@ -203,19 +228,24 @@ def render_trip_summary(snapshot: Dict[str, Any]) -> None:
     budget = _fmt_value(trip.get("budget"))
     pace = _fmt_value(trip.get("pace"))
 
+    st.sidebar.markdown(_trip_html(destination, dates, travelers, budget, pace), unsafe_allow_html=True)
+
+
+_SUMMARY_ROWS = (
+    ("📍", "Destination"),
+    ("🗓️", "Dates / Duration"),
+    ("👥", "Travelers"),
+    ("💸", "Budget"),
+    ("⚡", "Pace"),
+)
+
+
+@lru_cache(maxsize=128)
+def _trip_html(destination: str, dates: str, travelers: str, budget: str, pace: str) -> str:
     # Render as one complete HTML block with no gaps
-    full_html = f"""
-<div class="ta-card">
-<div class="ta-title">Trip summary</div>
-{_row("📍", "Destination", destination)}
-{_row("🗓️", "Dates / Duration", dates)}
-{_row("👥", "Travelers", travelers)}
-{_row("💸", "Budget", budget)}
-{_row("⚡", "Pace", pace)}
-</div>
-"""
-    
-    st.sidebar.markdown(full_html, unsafe_allow_html=True)
+    values = (destination, dates, travelers, budget, pace)
+    rows = "".join([_row(icon, label, value) for (icon, label), value in zip(_SUMMARY_ROWS, values)])
+    return f'<div class="ta-card"><div class="ta-title">Trip summary</div>{rows}</div>'
 
 
 def render_sidebar() -> None:
@@ -253,18 +283,8 @@ def render_chat() -> None:
             st.write(msg["content"])
 
 
-# ----------------------------
-# Main
-# ----------------------------
-def main() -> None:
-    st.set_page_config(page_title="Travel Assistant", page_icon="📍", layout="wide")
-    inject_css()
-
-    st.title("📍 Travel Assistant")
-    st.caption("Ask about itineraries, attractions, packing, weather, or currency conversion.")
-
-    ensure_session()
-    render_sidebar()
+@st.fragment
+def chat_fragment() -> None:
     render_chat()
 
     user_input = st.chat_input("Ask me about your trip…", disabled=st.session_state["busy"])
@@ -276,17 +296,20 @@ def main() -> None:
     with st.chat_message("user"):
         st.write(user_input)
 
+    prev_trip = (st.session_state["snapshot"] or {}).get("trip_profile")
     st.session_state["busy"] = True
     try:
         with st.spinner("Thinking..."):
-            assistant_text = send_to_backend(st.session_state["session_id"], user_input)
+            assistant_text, snapshot = send_to_backend(st.session_state["session_id"], user_input)
 
         st.session_state["messages"].append({"role": "assistant", "content": assistant_text})
         with st.chat_message("assistant"):
             st.write(assistant_text)
 
         # Refresh snapshot after each turn
-        st.session_state["snapshot"] = fetch_snapshot(st.session_state["session_id"])
+        if snapshot is None:
+            snapshot = fetch_snapshot(st.session_state["session_id"])
+        st.session_state["snapshot"] = snapshot
 
     except requests.RequestException:
         msg = "I couldn’t reach the backend. Make sure the API is running on http://127.0.0.1:8000."
@@ -296,6 +319,25 @@ def main() -> None:
     finally:
         st.session_state["busy"] = False
 
+    # Key line: the sidebar is outside this fragment; rerun the app only if the trip profile changed.
+    if (st.session_state["snapshot"] or {}).get("trip_profile") != prev_trip:
+        st.rerun(scope="app")
+
+
+# ----------------------------
+# Main
+# ----------------------------
+def main() -> None:
+    st.set_page_config(page_title="Travel Assistant", page_icon="📍", layout="wide")
+    inject_css()
+
+    st.title("📍 Travel Assistant")
+    st.caption("Ask about itineraries, attractions, packing, weather, or currency conversion.")
+
+    ensure_session()
+    render_sidebar()
+    chat_fragment()
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()